@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Compare the size and speed of ``flickr_api.binary`` against JSON.
+
+This encodes a batch of photos with both formats, then decodes them,
+and prints the size of the output and the time taken for each step.
+
+    $ python3 benchmarks/binary_codec.py
+    $ python3 benchmarks/binary_codec.py --count 100000
+
+The photos are all variants of a real photo from our test fixtures,
+with a handful of different owners and licenses, which is similar to
+a crawl of the photos in a single Commons collection.
+"""
+
+import argparse
+from collections.abc import Callable
+import json
+from pathlib import Path
+import time
+import typing
+
+from nitrate.json import NitrateDecoder, NitrateEncoder
+
+from flickr_api.binary import BinaryDecoder, BinaryEncoder
+from flickr_api.models import SinglePhoto
+
+
+def create_photos(count: int) -> list[SinglePhoto]:
+    """
+    Create a list of photos to use in the benchmark.
+    """
+    fixture_path = (
+        Path(__file__).parent.parent / "tests/fixtures/api_responses/32812033543.json"
+    )
+
+    with open(fixture_path) as in_file:
+        photo: SinglePhoto = json.load(in_file, cls=NitrateDecoder)
+
+    photos: list[SinglePhoto] = []
+
+    for i in range(count):
+        owner_id = f"{i % 50}@N01"
+
+        photos.append(
+            {
+                **photo,
+                "id": str(32812033543 + i),
+                "owner": {**photo["owner"], "id": owner_id},
+                "count_views": photo["count_views"] + i,
+            }
+        )
+
+    return photos
+
+
+def measure(label: str, fn: Callable[[], typing.Any]) -> typing.Any:
+    """
+    Run a function, print how long it took, and return the result.
+    """
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    print(f"  {label:<8} {elapsed * 1000:8.1f} ms")
+
+    return result
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+
+    photos = create_photos(args.count)
+
+    print(f"JSON ({args.count} photos):")
+    json_encoder = NitrateEncoder(separators=(",", ":"))
+    json_decoder = NitrateDecoder()
+    json_lines = measure("encode", lambda: [json_encoder.encode(p) for p in photos])
+    measure("decode", lambda: [json_decoder.decode(line) for line in json_lines])
+    json_size = sum(len(line.encode("utf8")) + 1 for line in json_lines)
+    print(f"  size     {json_size:8d} bytes")
+
+    print(f"MessagePack ({args.count} photos):")
+    binary_encoder = BinaryEncoder()
+    binary_decoder = BinaryDecoder()
+    binary_records = measure(
+        "encode", lambda: [binary_encoder.encode(p) for p in photos]
+    )
+    decoded = measure(
+        "decode", lambda: [binary_decoder.decode(r) for r in binary_records]
+    )
+    binary_size = sum(len(r) for r in binary_records)
+    print(f"  size     {binary_size:8d} bytes ({binary_size / json_size:.0%} of JSON)")
+
+    assert decoded == photos
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from .api import FlickrApi
-from .downloader import download_file
+from .downloader import download_file, download_files
 from .exceptions import (
     FlickrApiException,
+    IncompleteDownload,
     InsufficientPermissionsToComment,
     InvalidApiKey,
     InvalidXmlException,
@@ -13,13 +14,15 @@ from .exceptions import (
 )
 
 
-__version__ = "3.12.1"
+__version__ = "3.37.18"
 
 
 __all__ = [
     "download_file",
+    "download_files",
     "FlickrApi",
     "FlickrApiException",
+    "IncompleteDownload",
     "ResourceNotFound",
     "InvalidApiKey",
     "InvalidXmlException",
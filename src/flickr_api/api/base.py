@@ -22,7 +22,9 @@ from ..exceptions import (
     InvalidXmlException,
     UnrecognisedFlickrApiException,
 )
+from ..parsers import UserCache
 from ..retrying import is_retryable
+from ..user_id_cache import UserIdCache
 
 
 HttpMethod = typing.Literal["GET", "POST"]
@@ -39,6 +41,15 @@ class FlickrApi(abc.ABC):
     the underlying HTTP framework easily if we wanted to.
     """
 
+    # If this is set, the ``User`` objects in API responses are shared
+    # between responses rather than created fresh every time.
+    # See ``flickr_api.parsers.UserCache``.
+    user_cache: UserCache | None = None
+
+    # If this is set, user IDs looked up from profile URLs are saved
+    # and reused.  See ``flickr_api.user_id_cache.UserIdCache``.
+    user_id_cache: UserIdCache | None = None
+
     @abc.abstractmethod
     def call(
         self,
@@ -69,18 +80,35 @@ class HttpxImplementation(FlickrApi):
     and ``tenacity`` for retrying failed API calls.
     """
 
-    def __init__(self, client: httpx.Client) -> None:
+    def __init__(
+        self,
+        client: httpx.Client,
+        *,
+        user_cache: UserCache | None = None,
+        user_id_cache: UserIdCache | None = None,
+    ) -> None:
         """
         Create an API from an ``httpx`` client.
 
         This is useful if you want to customise the behaviour of the
         underlying client.
         """
+        super().__init__()
+
         client.base_url = httpx.URL("https://api.flickr.com/services/rest/")
         self.client = client
+        self.user_cache = user_cache
+        self.user_id_cache = user_id_cache
 
     @classmethod
-    def with_api_key(cls, *, api_key: str, user_agent: str) -> typing.Self:
+    def with_api_key(
+        cls,
+        *,
+        api_key: str,
+        user_agent: str,
+        user_cache: UserCache | None = None,
+        user_id_cache: UserIdCache | None = None,
+    ) -> typing.Self:
         """
         Create a client from a Flickr API key.
 
@@ -97,7 +125,7 @@ class HttpxImplementation(FlickrApi):
             headers={"User-Agent": user_agent},
         )
 
-        return cls(client=client)
+        return cls(client=client, user_cache=user_cache, user_id_cache=user_id_cache)
 
     def call(
         self,
@@ -2,13 +2,23 @@
 Code to read/write comments on Flickr.
 """
 
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
 from flickr_url_parser import looks_like_flickr_photo_id
+import httpx
 from nitrate.xml import find_required_elem
 
 from .base import FlickrApi
-from ..exceptions import ResourceNotFound, InsufficientPermissionsToComment
+from ..concurrency import map_concurrently
+from ..exceptions import (
+    FlickrApiException,
+    ResourceNotFound,
+    InsufficientPermissionsToComment,
+)
 from ..models import Comment
 from ..parsers import create_user, parse_timestamp
+from ..rate_limiting import RateLimiter
 
 
 class CommentMethods(FlickrApi):
@@ -22,12 +32,42 @@ class CommentMethods(FlickrApi):
 
         See https://www.flickr.com/services/api/flickr.photos.comments.getList.htm
         """
+        return self._list_comments(photo_id=photo_id, params={})
+
+    def list_comments_since(
+        self, *, photo_id: str, since: datetime, until: datetime | None = None
+    ) -> list[Comment]:
+        """
+        List the comments on a photo which were posted at or after
+        ``since``, and optionally at or before ``until``.
+
+        This is useful for polling a photo for new comments, because
+        Flickr only sends the new comments, rather than the whole thread.
+        Flickr compares dates to the second, so if you pass the date of
+        the newest comment you've already seen, you'll get it again.
+
+        The datetimes must be timezone-aware.
+
+        See https://www.flickr.com/services/api/flickr.photos.comments.getList.htm
+        """
+        params = {"min_comment_date": _to_timestamp(since)}
+
+        if until is not None:
+            params["max_comment_date"] = _to_timestamp(until)
+
+        return self._list_comments(photo_id=photo_id, params=params)
+
+    def _list_comments(self, *, photo_id: str, params: dict[str, int]) -> list[Comment]:
+        """
+        Call ``flickr.photos.comments.getList`` with the given parameters,
+        and return the comments.
+        """
         if not looks_like_flickr_photo_id(photo_id):
             raise ValueError(f"Not a Flickr photo ID: {photo_id!r}")
 
         resp = self.call(
             method="flickr.photos.comments.getList",
-            params={"photo_id": photo_id},
+            params={"photo_id": photo_id, **params},
             exceptions={
                 "1": ResourceNotFound(f"Could not find photo with ID: {photo_id!r}")
             },
@@ -57,6 +97,7 @@ class CommentMethods(FlickrApi):
                 realname=comment_elem.attrib["realname"],
                 path_alias=comment_elem.attrib["path_alias"],
                 is_deleted=author_is_deleted,
+                cache=self.user_cache,
             )
 
             result.append(
@@ -72,6 +113,36 @@ class CommentMethods(FlickrApi):
 
         return result
 
+    def iter_comments_for_photos(
+        self, photo_ids: Iterable[str], *, max_workers: int = 8
+    ) -> Iterator[Comment]:
+        """
+        List all the comments on many photos.
+
+        The API calls are made concurrently, using up to ``max_workers``
+        threads, and comments are yielded as soon as each photo's
+        comments have been fetched.  The comments on each photo are
+        yielded together, but the photos may not be in the same order
+        as ``photo_ids``.
+
+        Only a handful of photos are fetched at a time, so you can use
+        this to process comments on a large number of photos without
+        holding them all in memory.
+
+        If we can't get the comments for a photo (e.g. because it doesn't
+        exist), the exception is raised and no more comments are yielded.
+        """
+        for _, comments in map_concurrently(
+            lambda photo_id: self.list_all_comments(photo_id=photo_id),
+            photo_ids,
+            max_workers=max_workers,
+            catch=FlickrApiException,
+        ):
+            if isinstance(comments, FlickrApiException):
+                raise comments
+
+            yield from comments
+
     def post_comment(self, *, photo_id: str, comment_text: str) -> str:
         """
         Post a comment to Flickr.
@@ -97,3 +168,65 @@ class CommentMethods(FlickrApi):
         )
 
         return find_required_elem(xml, path=".//comment").attrib["id"]
+
+    def post_comments(
+        self,
+        comments: Iterable[tuple[str, str]],
+        *,
+        max_workers: int = 2,
+        max_per_second: float = 1,
+    ) -> dict[tuple[str, str], str | FlickrApiException | httpx.HTTPError]:
+        """
+        Post a batch of comments to Flickr.
+
+        This takes a series of ``(photo_id, comment_text)`` pairs, and
+        returns a dict from each pair to the ID of the new comment.
+
+        *   Duplicate pairs are only posted once.
+        *   Comments are posted concurrently, using up to ``max_workers``
+            threads, but no faster than ``max_per_second`` -- this is
+            separate from the retry logic for reading from the API, and
+            avoids being throttled when posting lots of comments.
+        *   If we can't post a comment (e.g. the photo doesn't exist,
+            we don't have permission, or the request times out), the
+            exception is returned for that comment, and we carry on
+            posting the others -- so you always get back a result for
+            every comment in the batch.
+        *   The photo IDs are checked before we post anything, and we
+            throw a ``ValueError`` if any of them are invalid.
+
+        """
+        comments = list(dict.fromkeys(comments))
+
+        for photo_id, _ in comments:
+            if not looks_like_flickr_photo_id(photo_id):
+                raise ValueError(f"Not a Flickr photo ID: {photo_id!r}")
+
+        rate_limiter = RateLimiter(max_per_second)
+
+        def post(comment: tuple[str, str]) -> str:
+            """
+            Post a single comment, waiting for the rate limiter first.
+            """
+            photo_id, comment_text = comment
+            rate_limiter.acquire()
+            return self.post_comment(photo_id=photo_id, comment_text=comment_text)
+
+        return dict(
+            map_concurrently(
+                post,
+                comments,
+                max_workers=max_workers,
+                catch=(FlickrApiException, httpx.HTTPError),
+            )
+        )
+
+
+def _to_timestamp(dt: datetime) -> int:
+    """
+    Convert a datetime to a Unix timestamp, as used by the Flickr API.
+    """
+    if dt.tzinfo is None:
+        raise ValueError(f"Datetime must be timezone-aware: {dt!r}")
+
+    return int(dt.timestamp())
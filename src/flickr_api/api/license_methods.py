@@ -6,7 +6,8 @@ When Flickr adds new licenses, we add support for them as follows:
 *   Add a new human-readable ID in `flickr_api.models.licenses`,
     e.g. we refer to a license as "cc-by-2.0" rather than "4"
 
-    This needs to be added to `LicenseId` and `NAME_TO_LICENSE_ID`.
+    This needs to be added to `LicenseId`, `NAME_TO_LICENSE_ID` and
+    `BUNDLED_LICENSES`.
 
 *   Optionally: add a new mapping to NAME_OVERRIDES, if you want to change
     the label on the license from that supplied by the Flickr API.
@@ -20,27 +21,82 @@ in the ticket where we added support for CC 4.0 licenses:
 https://github.com/Flickr-Foundation/flickr-photos-api/issues/158
 """
 
-import functools
+from collections.abc import Iterable, Iterator
 import itertools
-import re
+import threading
 import typing
 from xml.etree import ElementTree as ET
 
+import httpx
+
 from .base import FlickrApi
-from ..exceptions import LicenseNotFound, ResourceNotFound
+from ..concurrency import map_concurrently
+from ..exceptions import FlickrApiException, LicenseNotFound, ResourceNotFound
 from ..models import License, LicenseChange
-from ..models.licenses import LicenseChangeEntry, NAME_TO_LICENSE_ID, NAME_OVERRIDES
+from ..models.licenses import (
+    BUNDLED_LICENSES,
+    LicenseChangeEntry,
+    NAME_TO_LICENSE_ID,
+    NAME_OVERRIDES,
+)
 from ..parsers import parse_timestamp
 
 
+class LicenseRegistry:
+    """
+    A fixed set of licenses, indexed for fast lookups by numeric ID,
+    human-readable ID, and URL.
+    """
+
+    def __init__(self, licenses: dict[str, License]) -> None:
+        # Take a copy of the licenses, so modifying the licenses in one
+        # registry can't affect another, or the bundled snapshot.
+        self.by_numeric_id: dict[str, License] = {
+            num_id: License(**lic) for num_id, lic in licenses.items()
+        }
+        self.by_id: dict[str, License] = {
+            lic["id"]: lic for lic in self.by_numeric_id.values()
+        }
+        self.by_url = {lic["url"]: lic for lic in self.by_numeric_id.values()}
+
+    def lookup(self, id: str) -> License:
+        """
+        Return the license for a numeric or human-readable license ID.
+
+        We don't need to tell the two kinds of ID apart: numeric IDs
+        are always digits, and human-readable IDs never are.
+        """
+        try:
+            return self.by_numeric_id[id]
+        except KeyError:
+            pass
+
+        try:
+            return self.by_id[id]
+        except KeyError:
+            raise LicenseNotFound(license_id=id)
+
+
 class LicenseMethods(FlickrApi):
     """
     License-related methods for the Flickr API.
     """
 
-    # Note: this list of licenses almost never changes, so we call this once
-    # and cache the result for efficiency.
-    @functools.cache
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        # Note: this list of licenses almost never changes, so we start
+        # with the snapshot in ``BUNDLED_LICENSES``, and only fetch the
+        # list from the API if we see a license ID or URL that isn't in
+        # the snapshot.  We only do that once per client.
+        #
+        # We don't use ``functools.cache`` on the methods, because the
+        # cache holds a reference to every client forever, and it doesn't
+        # stop multiple threads fetching the licenses at the same time.
+        self._license_registry = LicenseRegistry(BUNDLED_LICENSES)
+        self._has_fetched_licenses = False
+        self._license_lock = threading.Lock()
+
     def get_licenses(self) -> dict[str, License]:
         """
         Returns a list of licenses, organised by numeric ID.
@@ -48,8 +104,49 @@ class LicenseMethods(FlickrApi):
         In particular, IDs can be looked up using the numeric ID
         returned by many Flickr API methods.
 
+        This list comes from a snapshot bundled with the library, unless
+        the client has fetched a newer list -- see ``refresh_licenses()``.
+
         See https://www.flickr.com/services/api/flickr.photos.licenses.getInfo.htm
         """
+        return self._license_registry.by_numeric_id
+
+    def refresh_licenses(self) -> dict[str, License]:
+        """
+        Fetch the latest list of licenses from the API, and use it
+        for all subsequent license lookups on this client.
+
+        You don't need to call this -- the client fetches the list
+        automatically if it sees a license it doesn't recognise -- but
+        you can call it (e.g. in a background thread) if you want to be
+        sure you have the latest labels and URLs.
+        """
+        with self._license_lock:
+            self._license_registry = LicenseRegistry(self._fetch_licenses())
+            self._has_fetched_licenses = True
+
+        return self._license_registry.by_numeric_id
+
+    def _refresh_licenses_once(self) -> LicenseRegistry:
+        """
+        Fetch the latest list of licenses from the API, unless this
+        client has already fetched it, and return the new registry.
+
+        This is safe to call from multiple threads; the API will only
+        be called once.
+        """
+        with self._license_lock:
+            if not self._has_fetched_licenses:
+                self._license_registry = LicenseRegistry(self._fetch_licenses())
+                self._has_fetched_licenses = True
+
+            return self._license_registry
+
+    def _fetch_licenses(self) -> dict[str, License]:
+        """
+        Fetch the list of licenses from the Flickr API, organised by
+        numeric ID.
+        """
         license_resp = self.call(method="flickr.photos.licenses.getInfo")
 
         # This API returns results in the form:
@@ -83,7 +180,6 @@ class LicenseMethods(FlickrApi):
 
         return {"id": human_readable_id, "label": label, "url": url}
 
-    @functools.cache
     def lookup_license_by_id(self, *, id: str) -> License:
         """
         Return the license for a license ID.
@@ -96,23 +192,24 @@ class LicenseMethods(FlickrApi):
             (e.g. "cc-by-2.0" ~> "CC BY 2.0")
 
         """
-        licenses = self.get_licenses()
+        try:
+            return self._license_registry.lookup(id)
+        except LicenseNotFound:
+            return self._refresh_licenses_once().lookup(id)
 
-        # If this is a numeric ID, then it must have come from the
-        # Flickr API.  Look it up directly in the dict.
-        if re.match(r"^[0-9]+$", id):
-            try:
-                return licenses[id]
-            except KeyError:
-                raise LicenseNotFound(license_id=id)
+    def _lookup_license_by_url(self, url: str) -> License:
+        """
+        Return the license for a license URL.
+        """
+        try:
+            return self._license_registry.by_url[url]
+        except KeyError:
+            pass
 
-        # Otherwise, this is a human-readable license ID from our
-        # library, so look for a matching license.
         try:
-            matching_license = next(lic for lic in licenses.values() if lic["id"] == id)
-            return matching_license
-        except StopIteration:
-            raise LicenseNotFound(license_id=id)
+            return self._refresh_licenses_once().by_url[url]
+        except KeyError:
+            raise LicenseNotFound(license_id=url)
 
     def get_license_history(self, photo_id: str) -> list[LicenseChange]:
         """
@@ -120,8 +217,6 @@ class LicenseMethods(FlickrApi):
 
         This always returns license events in sorted order.
         """
-        licenses_by_url = {lic["url"]: lic for lic in self.get_licenses().values()}
-
         # First call the getLicenseHistory API.
         # See https://www.flickr.com/services/api/flickr.photos.licenses.getLicenseHistory.html
         history_resp = self.call(
@@ -151,7 +246,7 @@ class LicenseMethods(FlickrApi):
             return [
                 {
                     "date_posted": date_posted,
-                    "license": licenses_by_url[license_url],
+                    "license": self._lookup_license_by_url(license_url),
                 }
             ]
 
@@ -165,8 +260,12 @@ class LicenseMethods(FlickrApi):
             [
                 {
                     "date_changed": parse_timestamp(elem.attrib["date_change"]),
-                    "old_license": licenses_by_url[elem.attrib["old_license_url"]],
-                    "new_license": licenses_by_url[elem.attrib["new_license_url"]],
+                    "old_license": self._lookup_license_by_url(
+                        elem.attrib["old_license_url"]
+                    ),
+                    "new_license": self._lookup_license_by_url(
+                        elem.attrib["new_license_url"]
+                    ),
                 }
                 for elem in history_elems
             ],
@@ -180,3 +279,27 @@ class LicenseMethods(FlickrApi):
             assert ev1["new_license"] == ev2["old_license"]
 
         return typing.cast(list[LicenseChange], license_events)
+
+    def get_license_histories(
+        self, photo_ids: Iterable[str], *, max_workers: int = 8
+    ) -> Iterator[
+        tuple[str, list[LicenseChange] | FlickrApiException | httpx.HTTPError]
+    ]:
+        """
+        Get the license history of many photos.
+
+        This yields ``(photo_id, history)`` pairs as the results arrive,
+        which may not be the same order as ``photo_ids``.  The API calls
+        are made concurrently, using up to ``max_workers`` threads.
+
+        If we can't get the history for a photo (e.g. because it
+        doesn't exist, or the request times out), the exception is
+        returned in place of the history, rather than stopping the
+        other photos.
+        """
+        yield from map_concurrently(
+            self.get_license_history,
+            photo_ids,
+            max_workers=max_workers,
+            catch=(FlickrApiException, httpx.HTTPError),
+        )
@@ -2,17 +2,22 @@
 Methods for getting information about a single photo in the Flickr API.
 """
 
+from collections.abc import Collection, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 import typing
 from xml.etree import ElementTree as ET
 
+import httpx
 from flickr_url_parser import looks_like_flickr_photo_id
 from nitrate.xml import find_optional_text, find_required_elem, find_required_text
 
 from .license_methods import LicenseMethods
-from ..exceptions import PermissionDenied, ResourceNotFound
+from ..concurrency import map_concurrently
+from ..exceptions import FlickrApiException, PermissionDenied, ResourceNotFound
 from ..models import (
     AlbumContext,
     BoundingBox,
+    ContextKind,
     Editability,
     ExifTag,
     GalleryContext,
@@ -22,6 +27,7 @@ from ..models import (
     Note,
     Person,
     PhotoContext,
+    PhotoState,
     SinglePhotoInfo,
     SinglePhoto,
     Size,
@@ -94,6 +100,7 @@ class SinglePhotoMethods(LicenseMethods):
             username=owner_elem.attrib["username"],
             realname=owner_elem.attrib["realname"],
             path_alias=owner_elem.attrib["path_alias"],
+            cache=self.user_cache,
         )
 
         dates = find_required_elem(photo_elem, path="dates").attrib
@@ -193,6 +200,7 @@ class SinglePhotoMethods(LicenseMethods):
                         realname=n.attrib["authorrealname"],
                         path_alias=None,
                         is_deleted=n.attrib["authorisdeleted"] == "1",
+                        cache=self.user_cache,
                     ),
                     "bounding_box": {
                         "x": int(n.attrib["x"]),
@@ -450,6 +458,7 @@ class SinglePhotoMethods(LicenseMethods):
                 realname=person_elem.attrib.get("realname"),
                 path_alias=person_elem.attrib["path_alias"],
                 is_deleted=person_elem.attrib["is_deleted"] == "1",
+                cache=self.user_cache,
             )
 
             try:
@@ -470,33 +479,125 @@ class SinglePhotoMethods(LicenseMethods):
         """
         Check if a photo has been deleted from Flickr.
 
-        TODO: This can tell us whether a photo exists, but not whether
-        it's been deleted -- we can't know whether a given photo ID
-        never existed, or if it used to exist but doesn't.
+        This is a shortcut for ``get_photo_state()``.  Note that the API
+        can't tell us whether a photo was deleted or never existed, so
+        this returns True for both.
+        """
+        return self.get_photo_state(photo_id=photo_id) == "not_found"
+
+    def get_photo_state(self, *, photo_id: str) -> PhotoState:
+        """
+        Check whether a photo exists, doesn't exist, or is private.
 
-        We should change this method to ``get_photo_state()`` returning
-        an enum like exists/does_not_exist/private.
+        This only looks at the visibility of the photo in the API
+        response, so it's much cheaper than ``get_single_photo_info()``.
         """
+        # See https://www.flickr.com/services/api/flickr.photos.getInfo.html
         try:
-            self.call(
+            resp = self.call(
                 method="flickr.photos.getInfo",
                 params={"photo_id": photo_id},
                 exceptions={"1": ResourceNotFound()},
             )
         except ResourceNotFound:
-            return True
+            return "not_found"
+
+        # The visibility of the photo is in an element like:
+        #
+        #     <visibility ispublic="1" isfriend="0" isfamily="0"/>
+        #
+        visibility_elem = find_required_elem(resp, path="photo/visibility")
+
+        if visibility_elem.attrib["ispublic"] == "1":
+            return "exists"
         else:
-            return False
+            return "private"
+
+    def get_photo_states(
+        self, photo_ids: Iterable[str], *, max_workers: int = 8
+    ) -> Iterator[tuple[str, PhotoState | FlickrApiException | httpx.HTTPError]]:
+        """
+        Check whether many photos exist, don't exist, or are private.
 
-    def get_photo_contexts(self, *, photo_id: str) -> PhotoContext:
+        This yields ``(photo_id, state)`` pairs as the results arrive,
+        which may not be the same order as ``photo_ids``.  The API calls
+        are made concurrently, using up to ``max_workers`` threads.
+
+        If we get an unexpected error for a photo (e.g. the request
+        times out), the exception is returned in place of the state,
+        rather than stopping the other photos.
+        """
+        yield from map_concurrently(
+            lambda photo_id: self.get_photo_state(photo_id=photo_id),
+            photo_ids,
+            max_workers=max_workers,
+            catch=(FlickrApiException, httpx.HTTPError),
+        )
+
+    def get_photo_contexts(
+        self,
+        *,
+        photo_id: str,
+        include: Iterable[ContextKind] = ("albums", "galleries", "groups"),
+    ) -> PhotoContext:
         """
         Find the contexts where this photo appears on Flickr.
 
-        This includes albums, galleries, and groups.
+        This includes albums, galleries, and groups.  If you only need
+        some of them, pass them as ``include``, and we'll skip any API
+        calls we don't need -- the other lists will be empty.
+
+            >>> api.get_photo_contexts(photo_id="…", include=["albums", "groups"])
+
+        Albums and groups come from one API call, and galleries from
+        another.  If we need both calls, we make them at the same time.
         """
         if not looks_like_flickr_photo_id(photo_id):
             raise ValueError(f"Not a Flickr photo ID: {photo_id!r}")
 
+        include = set(include)
+
+        unknown_kinds = include - set(typing.get_args(ContextKind))
+        if unknown_kinds:
+            raise ValueError(f"Unrecognised context kinds: {sorted(unknown_kinds)}")
+
+        needs_all_contexts = "albums" in include or "groups" in include
+        needs_galleries = "galleries" in include
+
+        albums: list[AlbumContext] = []
+        groups: list[GroupContext] = []
+        galleries: list[GalleryContext] = []
+
+        if needs_all_contexts and needs_galleries:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                all_contexts_future = executor.submit(
+                    self._get_albums_and_groups_for_photo, photo_id=photo_id
+                )
+                galleries_future = executor.submit(
+                    self._get_galleries_for_photo, photo_id=photo_id
+                )
+
+            # Get the result of ``getAllContexts`` first -- if the photo
+            # doesn't exist, this throws a more useful error.
+            albums, groups = all_contexts_future.result()
+            galleries = galleries_future.result()
+        elif needs_all_contexts:
+            albums, groups = self._get_albums_and_groups_for_photo(photo_id=photo_id)
+        elif needs_galleries:
+            galleries = self._get_galleries_for_photo(photo_id=photo_id)
+
+        return {
+            "albums": albums if "albums" in include else [],
+            "galleries": galleries,
+            "groups": groups if "groups" in include else [],
+        }
+
+    def _get_albums_and_groups_for_photo(
+        self, *, photo_id: str
+    ) -> tuple[list[AlbumContext], list[GroupContext]]:
+        """
+        Return all the albums and groups that a photo appears in.
+        """
         # See https://www.flickr.com/services/api/flickr.photos.getAllContexts.html
         contexts_resp = self.call(
             method="flickr.photos.getAllContexts",
@@ -550,12 +651,53 @@ class SinglePhotoMethods(LicenseMethods):
             for pool_elem in contexts_resp.findall(".//pool")
         ]
 
+        return albums, groups
+
+    def _get_galleries_for_photo(self, *, photo_id: str) -> list[GalleryContext]:
+        """
+        Return all the galleries that a photo appears in.
+
+        We fetch the first page of galleries to find out how many pages
+        there are, then fetch the remaining pages concurrently.
+        """
         # See https://www.flickr.com/services/api/flickr.galleries.getListForPhoto.html
-        galleries_resp = self.call(
+        first_page_resp = self.call(
             method="flickr.galleries.getListForPhoto",
             params={"photo_id": photo_id, "per_page": "500"},
         )
+        first_page_elem = find_required_elem(first_page_resp, path="galleries")
 
+        galleries = self._parse_galleries_elem(first_page_elem)
+
+        pages = int(first_page_elem.attrib["pages"])
+
+        if pages > 1:
+
+            def get_page(page: int) -> list[GalleryContext]:
+                """
+                Get a single page of galleries.
+                """
+                resp = self.call(
+                    method="flickr.galleries.getListForPhoto",
+                    params={"photo_id": photo_id, "per_page": "500", "page": page},
+                )
+                return self._parse_galleries_elem(
+                    find_required_elem(resp, path="galleries")
+                )
+
+            # ``Executor.map`` returns results in the same order as
+            # the inputs, so the galleries stay in page order.
+            with ThreadPoolExecutor(max_workers=min(pages - 1, 8)) as executor:
+                for page_galleries in executor.map(get_page, range(2, pages + 1)):
+                    galleries.extend(page_galleries)
+
+        return galleries
+
+    def _parse_galleries_elem(self, galleries_elem: ET.Element) -> list[GalleryContext]:
+        """
+        Parse the <galleries> element from a single page of results
+        from ``flickr.galleries.getListForPhoto``.
+        """
         # Within the response, the galleries are in XML with the following structure:
         #
         #
@@ -576,16 +718,6 @@ class SinglePhotoMethods(LicenseMethods):
         #         <description/>
         #       </gallery>
         #
-        galleries_elem = find_required_elem(galleries_resp, path="galleries")
-
-        # TODO: Add supporting for paginating through the list of galleries.
-        #
-        # I'm not sure there are any photos where this is actually necessary,
-        # so for now just throw and we can return to this if we actually see
-        # a photo where this is necessary.
-        if int(galleries_elem.attrib["pages"]) > 1:  # pragma: no cover
-            raise ValueError("Fetching more than one page of galleries is unsupported!")
-
         galleries: list[GalleryContext] = []
 
         for gallery_elem in galleries_elem.findall("gallery"):
@@ -607,6 +739,7 @@ class SinglePhotoMethods(LicenseMethods):
                 # element even when the user has one set, so we just
                 # have to accept we can't set one here.
                 realname=None,
+                cache=self.user_cache,
             )
 
             description_elem = find_required_elem(gallery_elem, path="description")
@@ -628,18 +761,79 @@ class SinglePhotoMethods(LicenseMethods):
                 }
             )
 
-        return {
-            "albums": albums,
-            "galleries": galleries,
-            "groups": groups,
-        }
+        return galleries
 
     def get_exif_tags_for_photo(self, photo_id: str) -> list[ExifTag]:
         """
         Return a list of EXIF/TIFF/GPS tags for a given photo.
         """
+        resp = self._get_exif_resp(photo_id=photo_id)
+
+        return [
+            self._parse_exif_elem(exif_elem) for exif_elem in resp.findall("photo/exif")
+        ]
+
+    def get_exif_tags_for_photos(
+        self,
+        photo_ids: Iterable[str],
+        *,
+        tags: Collection[tuple[str, str]] | None = None,
+        max_workers: int = 8,
+    ) -> Iterator[
+        tuple[
+            str,
+            dict[tuple[str, str], ExifTag] | FlickrApiException | httpx.HTTPError,
+        ]
+    ]:
+        """
+        Get the EXIF/TIFF/GPS tags for many photos.
+
+        This yields ``(photo_id, exif)`` pairs as the results arrive, which
+        may not be the same order as ``photo_ids``.  Each ``exif`` is a dict
+        indexed by ``(tagspace, tag)``, e.g.
+
+            >>> exif[("IFD0", "Make")]
+            {"tagspace": "IFD0", "tag": "Make", "raw_value": "Canon", …}
+
+        If you pass ``tags``, a collection of ``(tagspace, tag)`` pairs,
+        we only return those tags, and skip parsing all the others.
+
+        The API calls are made concurrently, using up to ``max_workers``
+        threads.  If we can't get the EXIF data for a photo (e.g. because
+        the owner has hidden it and we get ``PermissionDenied``, or the
+        request times out), the exception is returned for that photo.
+        """
+        wanted_tags = None if tags is None else frozenset(tags)
+
+        def get_exif(photo_id: str) -> dict[tuple[str, str], ExifTag]:
+            """
+            Get the EXIF tags for a single photo, skipping tags we don't want.
+            """
+            resp = self._get_exif_resp(photo_id=photo_id)
+
+            result: dict[tuple[str, str], ExifTag] = {}
+
+            for exif_elem in resp.findall("photo/exif"):
+                key = (exif_elem.attrib["tagspace"], exif_elem.attrib["tag"])
+
+                if wanted_tags is None or key in wanted_tags:
+                    result[key] = self._parse_exif_elem(exif_elem)
+
+            return result
+
+        yield from map_concurrently(
+            get_exif,
+            photo_ids,
+            max_workers=max_workers,
+            catch=(FlickrApiException, httpx.HTTPError),
+        )
+
+    def _get_exif_resp(self, *, photo_id: str) -> ET.Element:
+        """
+        Call the ``flickr.photos.getExif`` API for a photo.
+        """
         # See https://www.flickr.com/services/api/flickr.photos.getExif.html
-        resp = self.call(
+        return self.call(
             method="flickr.photos.getExif",
             params={"photo_id": photo_id},
             exceptions={
@@ -650,35 +844,36 @@ class SinglePhotoMethods(LicenseMethods):
             },
         )
 
-        # The format of the response will be of the form:
-        #
-        #   <photo id="4424" secret="06b8e43bc7" server="2">
-        #     <exif tagspace="TIFF" tagspaceid="1" tag="271" label="Manufacturer">
-        #       <raw>Canon</raw>
-        #     </exif>
-        #     <exif tagspace="EXIF" tagspaceid="0" tag="33437" label="Aperture">
-        #       <raw>90/10</raw>
-        #       <clean>f/9</clean>
-        #     </exif>
-        #     …
-        #
-        result: list[ExifTag] = []
-
-        for exif_elem in resp.findall("photo/exif"):
-            raw_value = find_optional_text(exif_elem, path="raw")
-            clean_value = find_optional_text(exif_elem, path="clean")
-
-            tag: ExifTag = {
-                "tagspace": exif_elem.attrib["tagspace"],
-                "tagspaceid": exif_elem.attrib["tagspaceid"],
-                "tag": exif_elem.attrib["tag"],
-                "label": exif_elem.attrib["label"],
-                "raw_value": raw_value,
-            }
+    @staticmethod
+    def _parse_exif_elem(exif_elem: ET.Element) -> ExifTag:
+        """
+        Parse a single <exif> element from the ``flickr.photos.getExif`` API.
 
-            if clean_value:
-                tag["clean_value"] = clean_value
+        The format of the response will be of the form:
 
-            result.append(tag)
+            <photo id="4424" secret="06b8e43bc7" server="2">
+              <exif tagspace="TIFF" tagspaceid="1" tag="271" label="Manufacturer">
+                <raw>Canon</raw>
+              </exif>
+              <exif tagspace="EXIF" tagspaceid="0" tag="33437" label="Aperture">
+                <raw>90/10</raw>
+                <clean>f/9</clean>
+              </exif>
+              …
 
-        return result
+        """
+        raw_value = find_optional_text(exif_elem, path="raw")
+        clean_value = find_optional_text(exif_elem, path="clean")
+
+        tag: ExifTag = {
+            "tagspace": exif_elem.attrib["tagspace"],
+            "tagspaceid": exif_elem.attrib["tagspaceid"],
+            "tag": exif_elem.attrib["tag"],
+            "label": exif_elem.attrib["label"],
+            "raw_value": raw_value,
+        }
+
+        if clean_value:
+            tag["clean_value"] = clean_value
+
+        return tag
@@ -2,14 +2,18 @@
 Methods for getting information about users from the Flickr API.
 """
 
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import typing
 from xml.etree import ElementTree as ET
 
+import httpx
 from flickr_url_parser import NotAFlickrUrl, UnrecognisedUrl, parse_flickr_url
 from nitrate.xml import find_optional_text, find_required_elem, find_required_text
 
 from .base import FlickrApi
-from ..exceptions import ResourceNotFound, UserDeleted
+from ..concurrency import map_concurrently
+from ..exceptions import FlickrApiException, ResourceNotFound, UserDeleted
 from ..models import ProfileInfo, UserInfo
 from ..parsers import fix_realname, parse_timestamp
 
@@ -61,7 +65,10 @@ class UserMethods(FlickrApi):
             if parsed_user_url["user_id"]:
                 user_id_from_url = parsed_user_url["user_id"]
             else:
-                user_id_from_url = self._lookup_user_id_for_user_url(user_url=user_url)
+                user_id_from_url = self._lookup_user_id_for_path_alias(
+                    user_url=user_url,
+                    path_alias=_get_path_alias(parsed_user_url["user_url"]),
+                )
 
         # Case 1: we got both a `user_id` and `user_url`, and they point
         # to the same user ID.
@@ -114,9 +121,91 @@ class UserMethods(FlickrApi):
 
         See https://www.flickr.com/services/api/flickr.people.getInfo.htm
         """
-        user_id = self._ensure_user_id(user_id=user_id, user_url=user_url)
+        resolved_user_id = self._ensure_user_id(user_id=user_id, user_url=user_url)
+
+        try:
+            return self._get_user(user_id=resolved_user_id)
+        except ResourceNotFound:
+            self._forget_user_url(user_url)
+            raise
+
+    def get_users(
+        self, users: Iterable[str], *, max_workers: int = 8
+    ) -> dict[str, UserInfo | FlickrApiException | httpx.HTTPError | ValueError]:
+        """
+        Get information about many users at once.
+
+        Each user can be a user ID or a link to their profile, and you
+        can mix the two, e.g.
+
+            >>> api.get_users([
+            ...     "12403504@N02",
+            ...     "https://www.flickr.com/photos/britishlibrary/",
+            ... ])
+
+        This returns a dict from each of ``users`` to their info.  If we
+        can't find a user (e.g. they've deleted their account, the URL
+        isn't a link to a user, or the request times out), the exception
+        is returned in place of their info.
+
+        Each user is only fetched once, even if they appear multiple
+        times (e.g. once by ID and once by URL).  The API calls are made
+        concurrently, using up to ``max_workers`` threads.
+        """
+        users = list(dict.fromkeys(users))
+
+        # User IDs never contain a slash, so anything that does is
+        # a profile URL we may need to resolve to a user ID.
+        def resolve_user_id(user: str) -> str | ValueError:
+            """
+            Return the user ID for a user ID or profile URL, or the
+            ``ValueError`` if the URL isn't a link to a user.
+            """
+            if "/" in user:
+                try:
+                    return self._ensure_user_id(user_url=user)
+                except ValueError as err:
+                    return err
+            else:
+                return user
+
+        resolved_ids = dict(
+            map_concurrently(
+                resolve_user_id,
+                users,
+                max_workers=max_workers,
+                catch=(FlickrApiException, httpx.HTTPError),
+            )
+        )
 
-        return self._get_user(user_id=user_id)
+        user_ids = {uid for uid in resolved_ids.values() if isinstance(uid, str)}
+
+        user_infos = dict(
+            map_concurrently(
+                lambda user_id: self._get_user(user_id=user_id),
+                user_ids,
+                max_workers=max_workers,
+                catch=(FlickrApiException, httpx.HTTPError),
+            )
+        )
+
+        result: dict[
+            str, UserInfo | FlickrApiException | httpx.HTTPError | ValueError
+        ] = {}
+
+        for user in users:
+            user_id = resolved_ids[user]
+
+            if isinstance(user_id, Exception):
+                result[user] = user_id
+                continue
+
+            result[user] = user_infos[user_id]
+
+            if isinstance(result[user], ResourceNotFound) and "/" in user:
+                self._forget_user_url(user)
+
+        return result
 
     def _get_user(self, *, user_id: str) -> UserInfo:
         """
@@ -277,6 +366,42 @@ class UserMethods(FlickrApi):
 
         return user_id
 
+    def _lookup_user_id_for_path_alias(self, *, user_url: str, path_alias: str) -> str:
+        """
+        Given the URL to a user's profile page and the path alias in
+        that URL, return their user ID.
+
+        If there's a user ID cache, we check it before calling the API,
+        and save the result afterwards.
+        """
+        if self.user_id_cache is None:
+            return self._lookup_user_id_for_user_url(user_url=user_url)
+
+        user_id = self.user_id_cache.get(path_alias)
+
+        if user_id is None:
+            user_id = self._lookup_user_id_for_user_url(user_url=user_url)
+            self.user_id_cache.set(path_alias, user_id)
+
+        return user_id
+
+    def _forget_user_url(self, user_url: str | None) -> None:
+        """
+        Remove the path alias in this URL from the user ID cache.
+
+        We call this when we can't find the user that a URL points to,
+        e.g. because they've deleted their account or changed their
+        path alias, so the next lookup goes back to the API.
+        """
+        if self.user_id_cache is None or user_url is None:
+            return
+
+        parsed_user_url = parse_flickr_url(user_url)
+        assert parsed_user_url["type"] == "user"
+
+        if parsed_user_url["user_id"] is None:
+            self.user_id_cache.delete(_get_path_alias(parsed_user_url["user_url"]))
+
     def get_profile(
         self, *, user_id: str | None = None, user_url: str | None = None
     ) -> ProfileInfo:
@@ -287,8 +412,20 @@ class UserMethods(FlickrApi):
 
         See https://www.flickr.com/services/api/flickr.profile.getProfile.html
         """
-        user_id = self._ensure_user_id(user_id=user_id, user_url=user_url)
+        resolved_user_id = self._ensure_user_id(user_id=user_id, user_url=user_url)
+
+        try:
+            return self._get_profile(user_id=resolved_user_id)
+        except ResourceNotFound:
+            self._forget_user_url(user_url)
+            raise
+
+    def _get_profile(self, *, user_id: str) -> ProfileInfo:
+        """
+        Return the profile information for a user ID.
 
+        See https://www.flickr.com/services/api/flickr.profile.getProfile.html
+        """
         profile_resp = self.call(
             method="flickr.profile.getProfile",
             params={"user_id": user_id},
@@ -320,3 +457,39 @@ class UserMethods(FlickrApi):
             "instagram": profile_elem.attrib["instagram"] or None,
             "pinterest": profile_elem.attrib["pinterest"] or None,
         }
+
+    def get_user_with_profile(
+        self, *, user_id: str | None = None, user_url: str | None = None
+    ) -> tuple[UserInfo, ProfileInfo]:
+        """
+        Return a user's info and their profile information.
+
+        This is equivalent to calling ``get_user()`` and ``get_profile()``,
+        but it only looks up the user ID once, and it calls
+        ``flickr.people.getInfo`` and ``flickr.profile.getProfile``
+        at the same time.
+        """
+        resolved_user_id = self._ensure_user_id(user_id=user_id, user_url=user_url)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            user_future = executor.submit(self._get_user, user_id=resolved_user_id)
+            profile_future = executor.submit(
+                self._get_profile, user_id=resolved_user_id
+            )
+
+        try:
+            return user_future.result(), profile_future.result()
+        except ResourceNotFound:
+            self._forget_user_url(user_url)
+            raise
+
+
+def _get_path_alias(user_url: str) -> str:
+    """
+    Return the path alias from a normalised user URL, e.g.
+
+        >>> _get_path_alias("https://www.flickr.com/photos/britishlibrary/")
+        "britishlibrary"
+
+    """
+    return user_url.rstrip("/").rsplit("/", 1)[-1]
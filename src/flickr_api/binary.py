@@ -0,0 +1,238 @@
+"""
+A compact binary encoding for API results, using MessagePack.
+
+This requires the optional ``msgpack`` dependencies:
+
+    $ pip install flickr-photos-api[msgpack]
+
+This is useful for passing results between processes, or caching them
+on disk.  Compared to JSON, it's smaller and faster to decode, because:
+
+*   Datetimes are stored as 12-byte binary values, not strings.
+*   Tuples and dict keys which aren't strings are stored as-is, e.g.
+    the ``(tagspace, tag)`` keys from ``get_exif_tags_for_photos()``.
+*   The same users and licenses appear in lots of records, so each
+    distinct user/license is only stored once -- subsequent uses are
+    a reference to the first copy.
+
+The encoder and decoder are stateful, because later records can refer
+to users and licenses in earlier records.  You must decode records
+in the same order they were encoded, with a single decoder, e.g.
+
+    encoder = BinaryEncoder()
+
+    with open("photos.bin", "wb") as out_file:
+        for photo in photos:
+            out_file.write(encoder.encode(photo))
+
+    with open("photos.bin", "rb") as in_file:
+        for photo in BinaryDecoder().decode_stream(in_file):
+            ...
+
+Any value that can be encoded will decode to an equal value.  Decoded
+users and licenses are shared between records, so don't modify them.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+import struct
+import typing
+
+import msgpack
+
+from .models import License, User
+
+
+__all__ = ["BinaryDecoder", "BinaryEncoder", "dumps", "loads"]
+
+
+# These are the MessagePack extension type codes we use.
+_DATETIME_UTC = 1
+_DATETIME_NAIVE = 2
+_DEFINE_SHARED_VALUE = 3
+_REFER_TO_SHARED_VALUE = 4
+_TUPLE = 5
+
+# Datetimes are stored as (seconds since the epoch, microseconds).
+_datetime_struct = struct.Struct(">qI")
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+
+# The sets of keys which identify a dict as a ``User`` or ``License``.
+_SHARED_KEYS = [
+    User.__required_keys__,
+    User.__required_keys__ | User.__optional_keys__,
+    License.__required_keys__,
+]
+
+
+class BinaryEncoder:
+    """
+    Encode API results as MessagePack.
+
+    Use a single ``BinaryEncoder`` for all the records you want to
+    decode together, so each user and license is only stored once.
+    """
+
+    def __init__(self) -> None:
+        self._shared_values: dict[tuple[tuple[str, typing.Any], ...], int] = {}
+
+    def encode(self, value: typing.Any) -> bytes:
+        """
+        Encode a single value.
+        """
+        # Any users or licenses first seen in this value are only
+        # remembered once it's been encoded successfully -- if we fail
+        # partway through, the caller won't write these bytes, so later
+        # records mustn't refer back to them.
+        new_values: dict[tuple[tuple[str, typing.Any], ...], int] = {}
+
+        encoded = msgpack.packb(self._prepare(value, new_values))
+        self._shared_values.update(new_values)
+
+        return encoded
+
+    def _prepare(
+        self,
+        value: typing.Any,
+        new_values: dict[tuple[tuple[str, typing.Any], ...], int],
+    ) -> typing.Any:
+        """
+        Replace any values which can't be stored in MessagePack directly
+        (datetimes, tuples) or which should be shared (users and licenses) with
+        MessagePack extension types.
+        """
+        if isinstance(value, dict):
+            if any(value.keys() == keys for keys in _SHARED_KEYS):
+                return self._prepare_shared_value(value, new_values)
+
+            return {
+                self._prepare(k, new_values): self._prepare(v, new_values)
+                for k, v in value.items()
+            }
+
+        if isinstance(value, list):
+            return [self._prepare(v, new_values) for v in value]
+
+        # MessagePack doesn't distinguish lists and tuples, so we store
+        # tuples as an extension type -- otherwise they'd decode as lists,
+        # which can't be used as dict keys.
+        if isinstance(value, tuple):
+            return msgpack.ExtType(
+                _TUPLE, msgpack.packb([self._prepare(v, new_values) for v in value])
+            )
+
+        if isinstance(value, datetime):
+            return _prepare_datetime(value)
+
+        return value
+
+    def _prepare_shared_value(
+        self,
+        value: dict[str, typing.Any],
+        new_values: dict[tuple[tuple[str, typing.Any], ...], int],
+    ) -> msgpack.ExtType:
+        """
+        Store a user or license, or a reference to it if we've already
+        stored it.
+        """
+        key = tuple(value.items())
+
+        try:
+            index = self._shared_values[key]
+        except KeyError:
+            try:
+                index = new_values[key]
+            except KeyError:
+                new_values[key] = len(self._shared_values) + len(new_values)
+                return msgpack.ExtType(_DEFINE_SHARED_VALUE, msgpack.packb(value))
+
+        return msgpack.ExtType(_REFER_TO_SHARED_VALUE, msgpack.packb(index))
+
+
+def _prepare_datetime(dt: datetime) -> msgpack.ExtType:
+    """
+    Store a datetime as a MessagePack extension type.
+
+    The models only use naive datetimes (for "date taken" values, which
+    are in an unknown timezone) and UTC datetimes.
+    """
+    if dt.tzinfo is None:
+        delta = dt - _EPOCH_NAIVE
+        code = _DATETIME_NAIVE
+    elif dt.utcoffset() == timedelta(0):
+        delta = dt - _EPOCH_UTC
+        code = _DATETIME_UTC
+    else:
+        raise ValueError(f"Cannot encode datetime with non-UTC timezone: {dt!r}")
+
+    seconds = delta.days * 86400 + delta.seconds
+
+    return msgpack.ExtType(code, _datetime_struct.pack(seconds, delta.microseconds))
+
+
+class BinaryDecoder:
+    """
+    Decode API results encoded by ``BinaryEncoder``.
+
+    Use a single ``BinaryDecoder`` to decode the records from
+    a ``BinaryEncoder``, in the same order they were encoded.
+    """
+
+    def __init__(self) -> None:
+        self._shared_values: list[typing.Any] = []
+
+    def decode(self, data: bytes) -> typing.Any:
+        """
+        Decode a single value.
+        """
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, strict_map_key=False)
+
+    def decode_stream(self, stream: typing.BinaryIO) -> Iterator[typing.Any]:
+        """
+        Decode a series of values from a file or stream, one at a time.
+        """
+        yield from msgpack.Unpacker(
+            stream, ext_hook=self._ext_hook, strict_map_key=False
+        )
+
+    def _ext_hook(self, code: int, data: bytes) -> typing.Any:
+        """
+        Convert a MessagePack extension type back into a Python value.
+        """
+        if code == _DATETIME_UTC:
+            seconds, microseconds = _datetime_struct.unpack(data)
+            return _EPOCH_UTC + timedelta(seconds=seconds, microseconds=microseconds)
+
+        elif code == _DATETIME_NAIVE:
+            seconds, microseconds = _datetime_struct.unpack(data)
+            return _EPOCH_NAIVE + timedelta(seconds=seconds, microseconds=microseconds)
+
+        elif code == _DEFINE_SHARED_VALUE:
+            value = msgpack.unpackb(data)
+            self._shared_values.append(value)
+            return value
+
+        elif code == _REFER_TO_SHARED_VALUE:
+            return self._shared_values[msgpack.unpackb(data)]
+
+        elif code == _TUPLE:
+            return tuple(self.decode(data))
+
+        else:
+            raise ValueError(f"Unrecognised MessagePack extension type: {code}")
+
+
+def dumps(value: typing.Any) -> bytes:
+    """
+    Encode a single value, e.g. a list of photos.
+    """
+    return BinaryEncoder().encode(value)
+
+
+def loads(data: bytes) -> typing.Any:
+    """
+    Decode a single value encoded by ``dumps()``.
+    """
+    return BinaryDecoder().decode(data)
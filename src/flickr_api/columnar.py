@@ -0,0 +1,199 @@
+"""
+Export photos as columnar data, e.g. for analysis in a dataframe.
+
+This requires the optional ``parquet`` dependencies:
+
+    $ pip install flickr-photos-api[parquet]
+
+You can write photos to a Parquet file as you fetch them:
+
+    from flickr_api.columnar import ParquetPhotoWriter
+
+    with ParquetPhotoWriter("photos.parquet") as writer:
+        for photo_id in photo_ids:
+            writer.write(api.get_single_photo_info(photo_id=photo_id))
+
+The photos are buffered in memory and written in row groups, so you can
+export very large numbers of photos without holding them all in memory.
+"""
+
+from pathlib import Path
+import types
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .models import SinglePhotoInfo
+
+
+__all__ = ["PHOTO_SCHEMA", "ParquetPhotoWriter", "PhotoColumnBuilder"]
+
+
+# Columns with a small number of distinct values are dictionary-encoded.
+_enum_type = pa.dictionary(pa.int8(), pa.string())
+
+
+PHOTO_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("media", _enum_type, nullable=False),
+        pa.field("owner_id", pa.string(), nullable=False),
+        pa.field("owner_username", pa.string(), nullable=False),
+        pa.field("license_id", _enum_type, nullable=False),
+        pa.field("safety_level", _enum_type, nullable=False),
+        pa.field("title", pa.string()),
+        pa.field("tags", pa.list_(pa.string()), nullable=False),
+        pa.field("original_format", pa.string()),
+        pa.field("rotation", pa.int16(), nullable=False),
+        pa.field("date_posted", pa.timestamp("s", tz="UTC"), nullable=False),
+        # The date taken is in the photo owner's local time, which
+        # we don't know, so this is a timestamp without a timezone.
+        # See ``flickr_api.parsers.parse_date_taken``.
+        pa.field("date_taken", pa.timestamp("s")),
+        pa.field("date_taken_granularity", _enum_type),
+        pa.field("latitude", pa.float64()),
+        pa.field("longitude", pa.float64()),
+        pa.field("location_accuracy", pa.int8()),
+        pa.field("count_comments", pa.int64(), nullable=False),
+        pa.field("count_views", pa.int64(), nullable=False),
+        pa.field("has_people", pa.bool_(), nullable=False),
+        pa.field("is_public", pa.bool_(), nullable=False),
+        pa.field("can_download", pa.bool_(), nullable=False),
+        pa.field("url", pa.string(), nullable=False),
+    ]
+)
+
+
+class PhotoColumnBuilder:
+    """
+    Accumulates photos into typed columns, which can then be turned
+    into an Arrow table.
+
+    Each photo is split into its columns as soon as it's added, so the
+    builder doesn't keep a reference to the original ``SinglePhotoInfo``.
+    """
+
+    def __init__(self) -> None:
+        self._columns: dict[str, list[object]] = {
+            name: [] for name in PHOTO_SCHEMA.names
+        }
+        self._length = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of photos added so far.
+        """
+        return self._length
+
+    def append(self, photo: SinglePhotoInfo) -> None:
+        """
+        Add a photo to the columns.
+        """
+        date_taken = photo["date_taken"]
+        location = photo["location"]
+
+        row: dict[str, object] = {
+            "id": photo["id"],
+            "media": photo["media"],
+            "owner_id": photo["owner"]["id"],
+            "owner_username": photo["owner"]["username"],
+            "license_id": photo["license"]["id"],
+            "safety_level": photo["safety_level"],
+            "title": photo["title"],
+            "tags": photo["tags"],
+            "original_format": photo["original_format"],
+            "rotation": photo["rotation"],
+            "date_posted": photo["date_posted"],
+            "date_taken": date_taken["value"] if date_taken else None,
+            "date_taken_granularity": (
+                date_taken["granularity"] if date_taken else None
+            ),
+            "latitude": location["latitude"] if location else None,
+            "longitude": location["longitude"] if location else None,
+            "location_accuracy": location["accuracy"] if location else None,
+            "count_comments": photo["count_comments"],
+            "count_views": photo["count_views"],
+            "has_people": photo["has_people"],
+            "is_public": photo["visibility"]["is_public"],
+            "can_download": photo["usage"]["can_download"],
+            "url": photo["url"],
+        }
+
+        for name, value in row.items():
+            self._columns[name].append(value)
+
+        self._length += 1
+
+    def to_table(self) -> pa.Table:
+        """
+        Return the photos added so far as an Arrow table.
+        """
+        return pa.Table.from_pydict(self._columns, schema=PHOTO_SCHEMA)
+
+    def clear(self) -> None:
+        """
+        Remove all the photos added so far.
+        """
+        for column in self._columns.values():
+            column.clear()
+
+        self._length = 0
+
+
+class ParquetPhotoWriter:
+    """
+    Write photos to a Parquet file, one row group at a time.
+
+    Photos are buffered until there are ``row_group_size`` of them,
+    then written to disk as a single row group.  Any remaining photos
+    are written when the writer is closed.
+    """
+
+    def __init__(self, path: str | Path, *, row_group_size: int = 100_000) -> None:
+        if row_group_size < 1:
+            raise ValueError(f"row_group_size must be positive: {row_group_size}")
+
+        self.row_group_size = row_group_size
+        self._builder = PhotoColumnBuilder()
+        self._writer = pq.ParquetWriter(str(path), schema=PHOTO_SCHEMA)
+
+    def write(self, photo: SinglePhotoInfo) -> None:
+        """
+        Add a photo to the file.
+        """
+        self._builder.append(photo)
+
+        if len(self._builder) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write any buffered photos to disk as a new row group.
+        """
+        if len(self._builder) > 0:
+            self._writer.write_table(self._builder.to_table())
+            self._builder.clear()
+
+    def close(self) -> None:
+        """
+        Write any buffered photos, and close the file.
+        """
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetPhotoWriter":
+        """
+        Use the writer as a context manager, which closes the file on exit.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """
+        Close the file when the ``with`` block exits.
+        """
+        self.close()
@@ -0,0 +1,534 @@
+"""
+Compact, read-only versions of the models in ``flickr_api.models``.
+
+The models returned by this library are TypedDicts, so every photo is
+a tree of dicts.  That's convenient for JSON, but it uses a lot of
+memory if you want to keep millions of photos in memory at once.
+
+This module has a ``__slots__`` dataclass for each of the main models,
+with the same field names, and a ``from_dict()`` method to convert
+a result from the API, e.g.
+
+    >>> photo = api.get_single_photo_info(photo_id="14898030836")
+    >>> compact_photo = SinglePhotoInfo.from_dict(photo)
+    >>> compact_photo.owner.username
+    'Lassen NPS'
+
+The compact models are frozen, and values which repeat a lot between
+photos (users, licenses, visibility/editability/usage flags) are shared
+between instances rather than copied.  Lists become tuples, and the
+machine tags dict becomes a tuple of ``(namespace:predicate, values)``
+pairs, so every compact model is hashable.
+"""
+
+import dataclasses
+from datetime import datetime
+import functools
+import typing
+
+from . import models
+
+
+__all__ = [
+    "BoundingBox",
+    "Comment",
+    "DateTaken",
+    "Editability",
+    "ExifTag",
+    "License",
+    "Location",
+    "Note",
+    "Person",
+    "SinglePhoto",
+    "SinglePhotoInfo",
+    "Size",
+    "Tag",
+    "Usage",
+    "User",
+    "Visibility",
+]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class User:
+    """
+    A compact version of ``flickr_api.models.User``.
+
+    The ``is_deleted`` field is always present, and ``False`` if
+    it was absent from the original ``User``.
+    """
+
+    id: str
+    username: str
+    realname: str | None
+    path_alias: str | None
+    photos_url: str
+    profile_url: str
+    is_deleted: bool = False
+
+    @classmethod
+    def from_dict(cls, user: models.User) -> "User":
+        """
+        Convert a ``User`` from the API into its compact form.
+        """
+        return _intern_user(
+            user["id"],
+            user["username"],
+            user["realname"],
+            user["path_alias"],
+            user["photos_url"],
+            user["profile_url"],
+            user.get("is_deleted", False),
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class License:
+    """
+    A compact version of ``flickr_api.models.License``.
+    """
+
+    id: models.LicenseId
+    label: str
+    url: str
+
+    @classmethod
+    def from_dict(cls, license: models.License) -> "License":
+        """
+        Convert a ``License`` from the API into its compact form.
+        """
+        return _intern_license(license["id"], license["label"], license["url"])
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class DateTaken:
+    """
+    A compact version of ``flickr_api.models.DateTaken``.
+    """
+
+    value: datetime
+    granularity: models.TakenGranularity
+
+    @classmethod
+    def from_dict(cls, date_taken: models.DateTaken) -> "DateTaken":
+        """
+        Convert a ``DateTaken`` from the API into its compact form.
+        """
+        return cls(value=date_taken["value"], granularity=date_taken["granularity"])
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Tag:
+    """
+    A compact version of ``flickr_api.models.Tag``.
+    """
+
+    raw_value: str
+    normalized_value: str
+    author_id: str
+    author_name: str
+    is_machine_tag: bool
+
+    @classmethod
+    def from_dict(cls, tag: models.Tag) -> "Tag":
+        """
+        Convert a ``Tag`` from the API into its compact form.
+        """
+        return cls(
+            raw_value=tag["raw_value"],
+            normalized_value=tag["normalized_value"],
+            author_id=tag["author_id"],
+            author_name=tag["author_name"],
+            is_machine_tag=tag["is_machine_tag"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BoundingBox:
+    """
+    A compact version of ``flickr_api.models.BoundingBox``.
+    """
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @classmethod
+    def from_dict(cls, bounding_box: models.BoundingBox) -> "BoundingBox":
+        """
+        Convert a ``BoundingBox`` from the API into its compact form.
+        """
+        return cls(
+            x=bounding_box["x"],
+            y=bounding_box["y"],
+            width=bounding_box["width"],
+            height=bounding_box["height"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Note:
+    """
+    A compact version of ``flickr_api.models.Note``.
+    """
+
+    id: str
+    author: User
+    bounding_box: BoundingBox
+    text: str
+
+    @classmethod
+    def from_dict(cls, note: models.Note) -> "Note":
+        """
+        Convert a ``Note`` from the API into its compact form.
+        """
+        return cls(
+            id=note["id"],
+            author=User.from_dict(note["author"]),
+            bounding_box=BoundingBox.from_dict(note["bounding_box"]),
+            text=note["text"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Person:
+    """
+    A compact version of ``flickr_api.models.Person``.
+    """
+
+    user: User
+    bounding_box: BoundingBox | None
+
+    @classmethod
+    def from_dict(cls, person: models.Person) -> "Person":
+        """
+        Convert a ``Person`` from the API into its compact form.
+        """
+        bounding_box = person["bounding_box"]
+
+        return cls(
+            user=User.from_dict(person["user"]),
+            bounding_box=(
+                BoundingBox.from_dict(bounding_box)
+                if bounding_box is not None
+                else None
+            ),
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Location:
+    """
+    A compact version of ``flickr_api.models.Location``.
+    """
+
+    latitude: float
+    longitude: float
+    accuracy: int
+    context: models.LocationContext | None
+    neighborhood: str | None
+    locality: str | None
+    county: str | None
+    region: str | None
+    country: str | None
+
+    @classmethod
+    def from_dict(cls, location: models.Location) -> "Location":
+        """
+        Convert a ``Location`` from the API into its compact form.
+        """
+        return cls(
+            latitude=location["latitude"],
+            longitude=location["longitude"],
+            accuracy=location["accuracy"],
+            context=location["context"],
+            neighborhood=location["neighborhood"],
+            locality=location["locality"],
+            county=location["county"],
+            region=location["region"],
+            country=location["country"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Visibility:
+    """
+    A compact version of ``flickr_api.models.Visibility``.
+    """
+
+    is_public: bool
+    is_friend: bool
+    is_family: bool
+
+    @classmethod
+    def from_dict(cls, visibility: models.Visibility) -> "Visibility":
+        """
+        Convert a ``Visibility`` from the API into its compact form.
+        """
+        return _intern_visibility(
+            visibility["is_public"], visibility["is_friend"], visibility["is_family"]
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Editability:
+    """
+    A compact version of ``flickr_api.models.Editability``.
+    """
+
+    can_comment: bool
+    can_add_meta: bool
+
+    @classmethod
+    def from_dict(cls, editability: models.Editability) -> "Editability":
+        """
+        Convert an ``Editability`` from the API into its compact form.
+        """
+        return _intern_editability(
+            editability["can_comment"], editability["can_add_meta"]
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Usage:
+    """
+    A compact version of ``flickr_api.models.Usage``.
+    """
+
+    can_download: bool
+    can_blog: bool
+    can_print: bool
+    can_share: bool
+
+    @classmethod
+    def from_dict(cls, usage: models.Usage) -> "Usage":
+        """
+        Convert a ``Usage`` from the API into its compact form.
+        """
+        return _intern_usage(
+            usage["can_download"],
+            usage["can_blog"],
+            usage["can_print"],
+            usage["can_share"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Size:
+    """
+    A compact version of ``flickr_api.models.Size``.
+
+    The ``width`` and ``height`` are always present for photos, but
+    may be ``None`` for videos.
+    """
+
+    label: str
+    width: int | None
+    height: int | None
+    media: models.MediaType
+    source: str
+
+    @classmethod
+    def from_dict(cls, size: models.Size) -> "Size":
+        """
+        Convert a ``Size`` from the API into its compact form.
+        """
+        return cls(
+            label=size["label"],
+            width=size["width"],
+            height=size["height"],
+            media=size["media"],
+            source=size["source"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ExifTag:
+    """
+    A compact version of ``flickr_api.models.ExifTag``.
+
+    The ``clean_value`` field is always present, and ``None`` if
+    it was absent from the original ``ExifTag``.
+    """
+
+    tagspace: str
+    tagspaceid: str
+    tag: str
+    label: str
+    raw_value: str | None
+    clean_value: str | None = None
+
+    @classmethod
+    def from_dict(cls, exif_tag: models.ExifTag) -> "ExifTag":
+        """
+        Convert an ``ExifTag`` from the API into its compact form.
+        """
+        return cls(
+            tagspace=exif_tag["tagspace"],
+            tagspaceid=exif_tag["tagspaceid"],
+            tag=exif_tag["tag"],
+            label=exif_tag["label"],
+            raw_value=exif_tag["raw_value"],
+            clean_value=exif_tag.get("clean_value"),
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Comment:
+    """
+    A compact version of ``flickr_api.models.Comment``.
+    """
+
+    id: str
+    photo_id: str
+    author: User
+    text: str
+    permalink: str
+    date: datetime
+
+    @classmethod
+    def from_dict(cls, comment: models.Comment) -> "Comment":
+        """
+        Convert a ``Comment`` from the API into its compact form.
+        """
+        return cls(
+            id=comment["id"],
+            photo_id=comment["photo_id"],
+            author=User.from_dict(comment["author"]),
+            text=comment["text"],
+            permalink=comment["permalink"],
+            date=comment["date"],
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _PhotoFields:
+    """
+    The fields shared by ``SinglePhotoInfo`` and ``SinglePhoto``.
+    """
+
+    id: str
+    media: models.MediaType
+
+    secret: str
+    server: str
+    farm: str
+    original_format: str | None
+
+    rotation: models.Rotation
+
+    owner: User
+
+    safety_level: models.SafetyLevel
+
+    license: License
+
+    title: str | None
+    description: str | None
+    tags: tuple[str, ...]
+    machine_tags: tuple[tuple[str, tuple[str, ...]], ...]
+    raw_tags: tuple[Tag, ...]
+    notes: tuple[Note, ...]
+
+    date_posted: datetime
+    date_taken: DateTaken | None
+    location: Location | None
+
+    count_comments: int
+    count_views: int
+    has_people: bool
+
+    visibility: Visibility
+    editability: Editability
+    public_editability: Editability
+    usage: Usage
+
+    url: str
+
+    @staticmethod
+    def _fields_from_dict(photo: models.SinglePhotoInfo) -> dict[str, typing.Any]:
+        """
+        Convert the fields of a ``SinglePhotoInfo`` into their compact forms.
+        """
+        date_taken = photo["date_taken"]
+        location = photo["location"]
+
+        return {
+            "id": photo["id"],
+            "media": photo["media"],
+            "secret": photo["secret"],
+            "server": photo["server"],
+            "farm": photo["farm"],
+            "original_format": photo["original_format"],
+            "rotation": photo["rotation"],
+            "owner": User.from_dict(photo["owner"]),
+            "safety_level": photo["safety_level"],
+            "license": License.from_dict(photo["license"]),
+            "title": photo["title"],
+            "description": photo["description"],
+            "tags": tuple(photo["tags"]),
+            "machine_tags": tuple(
+                (key, tuple(values)) for key, values in photo["machine_tags"].items()
+            ),
+            "raw_tags": tuple(Tag.from_dict(t) for t in photo["raw_tags"]),
+            "notes": tuple(Note.from_dict(n) for n in photo["notes"]),
+            "date_posted": photo["date_posted"],
+            "date_taken": (
+                DateTaken.from_dict(date_taken) if date_taken is not None else None
+            ),
+            "location": (
+                Location.from_dict(location) if location is not None else None
+            ),
+            "count_comments": photo["count_comments"],
+            "count_views": photo["count_views"],
+            "has_people": photo["has_people"],
+            "visibility": Visibility.from_dict(photo["visibility"]),
+            "editability": Editability.from_dict(photo["editability"]),
+            "public_editability": Editability.from_dict(photo["public_editability"]),
+            "usage": Usage.from_dict(photo["usage"]),
+            "url": photo["url"],
+        }
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SinglePhotoInfo(_PhotoFields):
+    """
+    A compact version of ``flickr_api.models.SinglePhotoInfo``.
+    """
+
+    @classmethod
+    def from_dict(cls, photo: models.SinglePhotoInfo) -> "SinglePhotoInfo":
+        """
+        Convert a ``SinglePhotoInfo`` from the API into its compact form.
+        """
+        return cls(**cls._fields_from_dict(photo))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SinglePhoto(_PhotoFields):
+    """
+    A compact version of ``flickr_api.models.SinglePhoto``.
+    """
+
+    sizes: tuple[Size, ...]
+
+    @classmethod
+    def from_dict(cls, photo: models.SinglePhoto) -> "SinglePhoto":
+        """
+        Convert a ``SinglePhoto`` from the API into its compact form.
+        """
+        return cls(
+            **cls._fields_from_dict(photo),
+            sizes=tuple(Size.from_dict(s) for s in photo["sizes"]),
+        )
+
+
+# These values repeat a lot between photos, so we keep a single
+# shared instance of each distinct value.  This is safe because
+# the compact models are frozen.
+_intern_user = functools.lru_cache(maxsize=4096)(User)
+_intern_license = functools.lru_cache(maxsize=None)(License)
+_intern_visibility = functools.lru_cache(maxsize=None)(Visibility)
+_intern_editability = functools.lru_cache(maxsize=None)(Editability)
+_intern_usage = functools.lru_cache(maxsize=None)(Usage)
@@ -0,0 +1,103 @@
+"""
+Run lots of calls at once, e.g. fetching information for many photos.
+
+Most of the time spent calling the Flickr API is spent waiting for
+the network, so we can speed up bulk operations by running calls
+in a pool of threads.
+
+We don't submit every item to the pool at once -- that would mean
+holding every pending call in memory, which matters when you're working
+with hundreds of thousands of photos.  Instead, we keep a small, fixed
+number of calls in flight, and yield results as they complete.
+"""
+
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import typing
+
+
+__all__ = ["map_concurrently"]
+
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+E = typing.TypeVar("E", bound=Exception)
+E2 = typing.TypeVar("E2", bound=Exception)
+
+
+@typing.overload
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int,
+    catch: type[E],
+) -> Generator[tuple[T, R | E], None, None]: ...
+
+
+@typing.overload
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int,
+    catch: tuple[type[E], type[E2]],
+) -> Generator[tuple[T, R | E | E2], None, None]: ...
+
+
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int,
+    catch: type[Exception] | tuple[type[Exception], ...],
+) -> Generator[tuple[T, typing.Any], None, None]:
+    """
+    Call ``fn`` on every item, using a pool of ``max_workers`` threads,
+    and yield ``(item, result)`` pairs in the order the calls complete.
+
+    If a call throws an exception of type ``catch`` (or one of the types,
+    if ``catch`` is a tuple), the exception is yielded as the result for
+    that item, and we carry on with the remaining items.  Any other
+    exception is raised immediately.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be positive: {max_workers}")
+
+    items_iter = iter(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[Future[R], T] = {}
+
+        def submit_next() -> None:
+            """
+            Submit the next item to the pool, if there are any left.
+            """
+            for item in items_iter:
+                pending[executor.submit(fn, item)] = item
+                break
+
+        # Keep a few items queued beyond the number of workers, so
+        # a worker never has to wait for us to submit more work.
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for fut in done:
+                    item = pending.pop(fut)
+                    submit_next()
+
+                    try:
+                        result: R | Exception = fut.result()
+                    except catch as exc:
+                        result = exc
+
+                    yield item, result
+        finally:
+            # If the caller stops early or we hit an unexpected error,
+            # don't start any calls that haven't started yet.
+            for fut in pending:
+                fut.cancel()
@@ -3,39 +3,167 @@ Functions for actually downloading a photo -- you get the URL from
 the Flickr API, then download the image itself here.
 """
 
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import hashlib
+import json
+import os
 from pathlib import Path
+import re
+import threading
 import typing
-import uuid
 
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
+from .concurrency import map_concurrently
+from .exceptions import IncompleteDownload
+from .rate_limiting import RateLimiter
 from .retrying import is_retryable
 
 
-default_client = httpx.Client(headers={"User-Agent": "flickr-photos-api"})
+__all__ = [
+    "DownloadJob",
+    "DownloadThrottle",
+    "DownloadedFile",
+    "download_file",
+    "download_files",
+]
+
+
+default_headers = {"User-Agent": "flickr-photos-api"}
+
+default_client = httpx.Client(headers=default_headers)
+
+
+# How we retry downloads: we retry errors which might be transient,
+# e.g. a dropped connection or an HTTP 5xx error, with an exponential
+# backoff between attempts.
+retry_downloads = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    retry=retry_if_exception(is_retryable),
+)
 
 
 class DownloadedFile(typing.TypedDict):
     """
     Represents a downloaded file.
+
+    The checksum is the name of the hash algorithm and the hex digest
+    of the file, e.g. ``sha256:9f86d081…``.
     """
 
     path: Path
     content_type: str
+    checksum: str
+
+
+class DownloadMetadata(typing.TypedDict):
+    """
+    What we know about a file we've downloaded, which we store in
+    a sidecar file so we can check later if the file has changed.
+    """
+
+    url: str
+    file_name: str
+    content_type: str
+    content_length: int
+    checksum: str
+    etag: str | None
+    last_modified: str | None
+
+
+class DownloadJob(typing.TypedDict):
+    """
+    A file to download with ``download_files()``.
+    """
+
+    url: str
+    download_dir: Path
+    base_name: str
+
+
+class DownloadThrottle:
+    """
+    Limit how much bandwidth and how many connections our downloads use,
+    so they don't starve other traffic, e.g. calls to the Flickr API.
+
+        throttle = DownloadThrottle(
+            max_bytes_per_second=10_000_000,
+            max_connections_per_host={"live.staticflickr.com": 4},
+        )
+
+    Pass the same throttle to every call to ``download_file()`` or
+    ``download_files()``, and the limits apply to all of them together.
+
+    The bandwidth limit allows bursts of up to one second's worth of
+    bytes.  Hosts which aren't in ``max_connections_per_host`` don't
+    have a connection limit.  The connection limit is for the host the
+    bytes actually come from: if a URL redirects to another host, we
+    only hold a slot for the original host until we get the redirect,
+    then we take a slot for the new host.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes_per_second: float | None = None,
+        max_connections_per_host: Mapping[str, int] | None = None,
+    ) -> None:
+        if max_bytes_per_second is None:
+            self._bandwidth = None
+        else:
+            self._bandwidth = RateLimiter(
+                max_bytes_per_second, burst=max_bytes_per_second
+            )
+
+        self._connections: dict[str, threading.BoundedSemaphore] = {}
+
+        for host, max_connections in (max_connections_per_host or {}).items():
+            if max_connections < 1:
+                raise ValueError(
+                    f"max connections for {host} must be positive: {max_connections}"
+                )
+
+            self._connections[host] = threading.BoundedSemaphore(max_connections)
+
+    def wait_for_bytes(self, amount: int) -> None:
+        """
+        Wait until we're allowed to use another ``amount`` bytes
+        of bandwidth.
+        """
+        if self._bandwidth is not None:
+            self._bandwidth.acquire(amount)
+
+    @contextmanager
+    def connection(self, url: str | httpx.URL) -> Iterator[None]:
+        """
+        Wait until we're allowed to open another connection to the host
+        in this URL, and hold on to that slot until the block exits.
+        """
+        semaphore = self._connections.get(httpx.URL(url).host)
+
+        if semaphore is None:
+            yield
+        else:
+            with semaphore:
+                yield
 
 
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=4, max=60),
-    retry=retry_if_exception(is_retryable),
-)
 def download_file(
     client: httpx.Client = default_client,
     *,
     url: str,
     download_dir: Path,
     base_name: str,
+    segments: int = 1,
+    segment_threshold: int = 64 * 1024 * 1024,
+    skip_if_unchanged: bool = False,
+    hash_algorithm: str = "sha256",
+    content_addressed_dir: Path | None = None,
+    throttle: DownloadThrottle | None = None,
 ) -> DownloadedFile:
     """
     Download a file from Flickr.com.
@@ -43,22 +171,315 @@ def download_file(
     This function will retry the download a certain number of times
     if it fails, e.g. if Flickr returns an error or if the download
     is rate-limited.
+
+    If the download fails partway through, the bytes we've already
+    downloaded are kept in a ``.partial`` file next to the final path,
+    and the next attempt resumes from the end of that file.  Don't
+    download the same URL to the same path in two places at once.
+
+    If you pass ``segments`` > 1, files which are bigger than
+    ``segment_threshold`` bytes are split into that many byte ranges,
+    which are downloaded in parallel over separate connections.  This
+    can be much faster for large files, e.g. original videos, because
+    a single connection is often limited by per-connection throughput.
+    We only do this if the server supports Range requests.
+
+    If you pass ``skip_if_unchanged=True``, we record the ``ETag`` and
+    ``Last-Modified`` headers in a ``.download.json`` file next to the
+    final path.  If you download the same URL to the same place again,
+    we ask the server if the file has changed, and if it hasn't, we
+    return the existing file without downloading it again.
+
+    We compute a checksum of the file as we download it, using
+    ``hash_algorithm`` (any algorithm supported by ``hashlib``).
+
+    If you pass ``content_addressed_dir``, each file is stored in that
+    directory under its checksum, and the final path is a hard link to
+    the stored file.  If you download the same bytes more than once,
+    e.g. because the same video was uploaded as two photos, we only
+    store one copy.  This directory must be on the same filesystem
+    as ``download_dir``.
+
+    If you pass a ``DownloadThrottle``, the download is slowed down
+    to stay within its limits.
     """
+    _check_options(segments=segments, hash_algorithm=hash_algorithm)
+
+    if throttle is None:
+        throttle = DownloadThrottle()
+
     download_dir.mkdir(exist_ok=True, parents=True)
 
-    download_path = download_dir / base_name
+    return _download_file_with_retries(
+        client,
+        url=url,
+        download_path=download_dir / base_name,
+        segments=segments,
+        segment_threshold=segment_threshold,
+        skip_if_unchanged=skip_if_unchanged,
+        hash_algorithm=hash_algorithm,
+        content_addressed_dir=content_addressed_dir,
+        throttle=throttle,
+    )
+
+
+def download_files(
+    jobs: Iterable[DownloadJob],
+    *,
+    client: httpx.Client | None = None,
+    max_workers: int = 8,
+    segments: int = 1,
+    segment_threshold: int = 64 * 1024 * 1024,
+    skip_if_unchanged: bool = False,
+    hash_algorithm: str = "sha256",
+    content_addressed_dir: Path | None = None,
+    throttle: DownloadThrottle | None = None,
+) -> Iterator[tuple[DownloadJob, DownloadedFile | Exception]]:
+    """
+    Download lots of files from Flickr.com, using a pool of
+    ``max_workers`` threads.
+
+    This yields a ``(job, result)`` pair for every job, in the order
+    the downloads complete.  The result is either the downloaded file,
+    or the exception we got when we gave up on the download -- one
+    failed download doesn't stop the others.
+
+    Each download is retried in the same way as ``download_file()``,
+    and the other options work in the same way.
+
+    All the downloads share a single ``httpx.Client``, so connections
+    to Flickr are reused between files.  If you pass your own client,
+    make sure its connection pool is at least as big as ``max_workers``.
+    """
+    _check_options(segments=segments, hash_algorithm=hash_algorithm)
+
+    if throttle is None:
+        throttle = DownloadThrottle()
+
+    if client is None:
+        max_connections = max_workers * segments
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+
+        with httpx.Client(headers=default_headers, limits=limits) as client:
+            yield from download_files(
+                jobs,
+                client=client,
+                max_workers=max_workers,
+                segments=segments,
+                segment_threshold=segment_threshold,
+                skip_if_unchanged=skip_if_unchanged,
+                hash_algorithm=hash_algorithm,
+                content_addressed_dir=content_addressed_dir,
+                throttle=throttle,
+            )
+
+        return
+
+    # We only need to create each download directory once, rather than
+    # once per file.  This set may be updated by several threads at
+    # once, but the worst case is that we call ``mkdir()`` twice,
+    # which is harmless.
+    created_dirs: set[Path] = set()
+
+    def download(job: DownloadJob) -> DownloadedFile:
+        """
+        Download a single file, creating its directory if necessary.
+        """
+        download_dir = job["download_dir"]
+
+        if download_dir not in created_dirs:
+            download_dir.mkdir(exist_ok=True, parents=True)
+            created_dirs.add(download_dir)
+
+        return _download_file_with_retries(
+            client,
+            url=job["url"],
+            download_path=download_dir / job["base_name"],
+            segments=segments,
+            segment_threshold=segment_threshold,
+            skip_if_unchanged=skip_if_unchanged,
+            hash_algorithm=hash_algorithm,
+            content_addressed_dir=content_addressed_dir,
+            throttle=throttle,
+        )
+
+    yield from map_concurrently(
+        download, jobs, max_workers=max_workers, catch=Exception
+    )
+
+
+@retry_downloads
+def _download_file_with_retries(
+    client: httpx.Client,
+    *,
+    url: str,
+    download_path: Path,
+    segments: int,
+    segment_threshold: int,
+    skip_if_unchanged: bool,
+    hash_algorithm: str,
+    content_addressed_dir: Path | None,
+    throttle: DownloadThrottle,
+) -> DownloadedFile:
+    """
+    Download a file to ``download_path``, plus a suffix for its
+    content type.  The parent directory must already exist.
+
+    If a previous attempt was interrupted, we resume from where it
+    stopped, rather than downloading the whole file again.
+    """
+    # We download to a partial file whose name depends on the URL,
+    # so if this attempt fails, the next attempt (or the next run of
+    # the program) can find the bytes we've already downloaded.
+    partial_path = _get_partial_path(url=url, download_path=download_path)
+
+    try:
+        offset = partial_path.stat().st_size
+    except FileNotFoundError:
+        offset = 0
+
+    headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+
+    # If we've downloaded this file before, ask the server to only send
+    # it again if it's changed.  We skip this if we're resuming a partial
+    # download, because then the previous file is already out-of-date.
+    metadata_path = _get_metadata_path(download_path)
+    previous = _read_metadata(metadata_path) if skip_if_unchanged else None
+
+    if (
+        offset == 0
+        and previous is not None
+        and previous["url"] == url
+        and _is_existing_file(
+            download_path.parent / previous["file_name"], previous["content_length"]
+        )
+    ):
+        if previous["etag"] is not None:
+            headers["If-None-Match"] = previous["etag"]
+
+        if previous["last_modified"] is not None:
+            headers["If-Modified-Since"] = previous["last_modified"]
 
     # We use a streaming response from HTTPX because some Flickr files
     # can be very big, e.g. original video files.  We don't need or
     # want to buffer the whole thing into memory.
-    tmp_path = download_path.with_suffix(f".{uuid.uuid4()}.tmp")
+    with _stream_with_redirects(
+        client, url=url, headers=headers, throttle=throttle
+    ) as resp:
+        # A 416 Range Not Satisfiable means the partial file is at least
+        # as long as the file on the server, so it's not a prefix of the
+        # file we want.  Throw it away and start again.
+        if resp.status_code == 416:
+            partial_path.unlink()
+            raise IncompleteDownload(
+                f"Unable to resume download of {url}, starting again"
+            )
+
+        # A 304 Not Modified means the file we already have is still
+        # the latest version, so we can return it as-is.
+        if resp.status_code == 304:
+            assert previous is not None
+            existing_path = download_path.parent / previous["file_name"]
+
+            # If you've changed the hash algorithm since we downloaded
+            # the file, we need to hash it again.
+            checksum = previous.get("checksum")
+
+            if checksum is None or checksum.split(":")[0] != hash_algorithm:
+                with open(existing_path, "rb") as in_file:
+                    checksum = _format_checksum(
+                        hashlib.file_digest(in_file, hash_algorithm)
+                    )
+
+            return {
+                "path": existing_path,
+                "content_type": previous["content_type"],
+                "checksum": checksum,
+            }
 
-    with client.stream("GET", url, follow_redirects=True) as resp:
         resp.raise_for_status()
 
-        with open(tmp_path, "xb") as out_file:
-            for data in resp.iter_bytes():
-                out_file.write(data)
+        # If the server sends us part of the file, check it's the part
+        # we asked for before we append it.  If the server sends us the
+        # whole file, we overwrite the partial file.
+        if resp.status_code == 206:
+            content_range = _parse_content_range(resp.headers.get("content-range"))
+
+            if content_range is None or content_range[0] != offset:
+                partial_path.unlink()
+                raise IncompleteDownload(
+                    f"Unexpected Content-Range when resuming download of {url}: "
+                    f"{resp.headers.get('content-range')!r}"
+                )
+
+            expected_size = content_range[1]
+            mode = "ab"
+        else:
+            expected_size = _get_content_length(resp)
+            mode = "wb"
+
+        # If this is a large file, we stop here and download it in
+        # segments instead.  We'll have received a few bytes of the
+        # body already, but we only look at the headers.
+        use_segments = (
+            mode == "wb"
+            and segments > 1
+            and expected_size is not None
+            and expected_size >= segment_threshold
+            and resp.headers.get("accept-ranges") == "bytes"
+        )
+
+        # We hash the file as we download it, so we don't have to read
+        # it back from disk afterwards.  If we're resuming a download,
+        # we start by hashing the bytes we already have.
+        if not use_segments:
+            if mode == "ab":
+                with open(partial_path, "rb") as in_file:
+                    hasher = hashlib.file_digest(in_file, hash_algorithm)
+            else:
+                hasher = hashlib.new(hash_algorithm)
+
+            # If we're throttling bandwidth, we pause between chunks.
+            # We stop reading from the connection while we wait, so
+            # the server slows down to match.
+            with open(partial_path, mode) as out_file:
+                for data in resp.iter_bytes():
+                    throttle.wait_for_bytes(len(data))
+                    out_file.write(data)
+                    hasher.update(data)
+
+    # If we download a file in segments, the bytes arrive out of order,
+    # so we have to hash the file once it's complete.
+    if use_segments:
+        assert expected_size is not None
+        _download_segments(
+            client,
+            url=str(resp.url),
+            path=partial_path,
+            size=expected_size,
+            segments=segments,
+            throttle=throttle,
+        )
+
+        with open(partial_path, "rb") as in_file:
+            hasher = hashlib.file_digest(in_file, hash_algorithm)
+
+    # Check we got the whole file before we give it its final name.
+    # If we got too few bytes, we can resume from the end; if we got
+    # too many, something's gone wrong and we have to start again.
+    actual_size = partial_path.stat().st_size
+
+    if expected_size is not None and actual_size != expected_size:
+        if actual_size > expected_size:
+            partial_path.unlink()
+
+        raise IncompleteDownload(
+            f"Expected {expected_size} bytes from {url}, got {actual_size}"
+        )
 
     # Now work out the correct file extension to use for this content type.
     #
@@ -77,7 +498,332 @@ def download_file(
     except KeyError:
         out_path = download_path
 
-    # Rename the temporarily downloaded file to the final file.
-    tmp_path.rename(out_path)
+    checksum = _format_checksum(hasher)
+
+    # Rename the partially downloaded file to the final file, or move
+    # it into the content-addressed store.
+    if content_addressed_dir is None:
+        partial_path.rename(out_path)
+    else:
+        _store_by_checksum(
+            partial_path,
+            out_path=out_path,
+            store_dir=content_addressed_dir,
+            checksum=checksum,
+        )
+
+    if skip_if_unchanged:
+        _write_metadata(
+            metadata_path,
+            {
+                "url": url,
+                "file_name": out_path.name,
+                "content_type": content_type,
+                "content_length": actual_size,
+                "checksum": checksum,
+                "etag": resp.headers.get("etag"),
+                "last_modified": resp.headers.get("last-modified"),
+            },
+        )
+
+    return {"path": out_path, "content_type": content_type, "checksum": checksum}
+
+
+def _check_options(*, segments: int, hash_algorithm: str) -> None:
+    """
+    Check the options for a download are valid, before we start
+    downloading anything.
+    """
+    if segments < 1:
+        raise ValueError(f"segments must be positive: {segments}")
+
+    # Variable-length algorithms like SHAKE can't give us a hex digest
+    # without a length, so we reject them along with unknown names.
+    try:
+        hashlib.new(hash_algorithm).hexdigest()
+    except (TypeError, ValueError):
+        raise ValueError(f"Unsupported hash algorithm: {hash_algorithm!r}")
+
+
+def _format_checksum(hasher: "hashlib._Hash") -> str:
+    """
+    Format a checksum as the name of the algorithm and the hex digest,
+    e.g. ``sha256:9f86d081…``.
+    """
+    return f"{hasher.name}:{hasher.hexdigest()}"
+
+
+def _store_by_checksum(
+    partial_path: Path, *, out_path: Path, store_dir: Path, checksum: str
+) -> None:
+    """
+    Move a downloaded file into the content-addressed store, and
+    create a hard link to it at ``out_path``.
+
+    Files are stored as ``{store_dir}/{algorithm}/{ab}/{abcdef…}``,
+    using the first two characters of the digest as a subdirectory,
+    so no single directory gets too big.
+    """
+    algorithm, digest = checksum.split(":")
+
+    stored_path = store_dir / algorithm / digest[:2] / (digest + out_path.suffix)
+    stored_path.parent.mkdir(exist_ok=True, parents=True)
+
+    # If we already have a copy of this file, we can throw away
+    # the copy we just downloaded.
+    if stored_path.exists():
+        partial_path.unlink()
+    else:
+        partial_path.rename(stored_path)
+
+    # If ``out_path`` is already a link to the stored file, there's
+    # nothing to do -- and we have to check, because renaming a link
+    # over another link to the same file does nothing.
+    try:
+        if out_path.samefile(stored_path):
+            return
+    except FileNotFoundError:
+        pass
+
+    # Create the link under a temporary name, then rename it, so we
+    # atomically replace any existing file at ``out_path``.
+    os.link(stored_path, partial_path)
+    partial_path.replace(out_path)
+
+
+def _download_segments(
+    client: httpx.Client,
+    *,
+    url: str,
+    path: Path,
+    size: int,
+    segments: int,
+    throttle: DownloadThrottle,
+) -> None:
+    """
+    Download a file as ``segments`` byte ranges in parallel, writing
+    each range to its place in ``path``.
+
+    If any segment fails, we delete ``path``, because we don't know
+    which parts of it contain valid bytes.
+    """
+    # Create a file of the right size up front, so each segment can
+    # write directly to its own part of the file.
+    with open(path, "wb") as out_file:
+        out_file.truncate(size)
+
+    segment_size = -(-size // segments)
+
+    ranges = [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            # Consume the iterator to re-raise any exceptions
+            for _ in executor.map(
+                lambda r: _download_segment(
+                    client, url=url, path=path, start=r[0], end=r[1], throttle=throttle
+                ),
+                ranges,
+            ):
+                pass
+    except Exception:
+        path.unlink()
+        raise
+
+
+def _download_segment(
+    client: httpx.Client,
+    *,
+    url: str,
+    path: Path,
+    start: int,
+    end: int,
+    throttle: DownloadThrottle,
+) -> None:
+    """
+    Download the bytes ``start``-``end`` (inclusive) of a file into
+    the same position in ``path``.
+
+    Each segment is retried on its own, and a retry resumes from the
+    last byte we wrote, so one flaky segment doesn't affect the others.
+    """
+    position = start
+
+    @retry_downloads
+    def download_remaining_bytes() -> None:
+        """
+        Download the bytes of this segment we don't have yet.
+        """
+        nonlocal position
+
+        headers = {"Range": f"bytes={position}-{end}"}
+
+        with _stream_with_redirects(
+            client, url=url, headers=headers, throttle=throttle
+        ) as resp:
+            resp.raise_for_status()
+
+            content_range = _parse_content_range(resp.headers.get("content-range"))
+
+            if (
+                resp.status_code != 206
+                or content_range is None
+                or content_range[0] != position
+            ):
+                raise IncompleteDownload(
+                    f"Unexpected response to Range request for {url}: "
+                    f"{resp.status_code} {resp.headers.get('content-range')!r}"
+                )
+
+            with open(path, "r+b") as out_file:
+                out_file.seek(position)
+
+                for data in resp.iter_bytes():
+                    if position + len(data) > end + 1:
+                        raise IncompleteDownload(
+                            f"Got too many bytes for range {start}-{end} of {url}"
+                        )
+
+                    throttle.wait_for_bytes(len(data))
+                    out_file.write(data)
+                    position += len(data)
+
+        if position != end + 1:
+            raise IncompleteDownload(
+                f"Got too few bytes for range {start}-{end} of {url}"
+            )
+
+    download_remaining_bytes()
+
+
+@contextmanager
+def _stream_with_redirects(
+    client: httpx.Client,
+    *,
+    url: str,
+    headers: dict[str, str],
+    throttle: DownloadThrottle,
+) -> Iterator[httpx.Response]:
+    """
+    Make a streaming GET request, following any redirects.
 
-    return {"path": out_path, "content_type": content_type}
+    We follow redirects one at a time, rather than letting HTTPX follow
+    them, so we can hold a connection slot for the host we're actually
+    talking to -- not the host in the original URL.
+    """
+    request = client.build_request("GET", url, headers=headers)
+
+    for _ in range(client.max_redirects + 1):
+        with throttle.connection(request.url):
+            resp = client.send(request, stream=True, follow_redirects=False)
+
+            try:
+                if resp.next_request is None:
+                    yield resp
+                    return
+
+                request = resp.next_request
+            finally:
+                resp.close()
+
+    raise httpx.TooManyRedirects("Exceeded maximum allowed redirects.", request=request)
+
+
+def _get_partial_path(*, url: str, download_path: Path) -> Path:
+    """
+    Return the path where we store a partially downloaded file.
+
+    This includes a hash of the URL, so we don't resume a download
+    with bytes from a different file.
+    """
+    url_hash = hashlib.sha256(url.encode("utf8")).hexdigest()[:16]
+
+    return download_path.with_suffix(f".{url_hash}.partial")
+
+
+def _get_metadata_path(download_path: Path) -> Path:
+    """
+    Return the path where we store the metadata for a downloaded file.
+    """
+    return download_path.with_suffix(".download.json")
+
+
+def _read_metadata(path: Path) -> DownloadMetadata | None:
+    """
+    Read the metadata for a previously downloaded file, or return
+    ``None`` if there isn't any (or we can't read it).
+    """
+    try:
+        with open(path) as in_file:
+            metadata: DownloadMetadata = json.load(in_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return metadata
+
+
+def _write_metadata(path: Path, metadata: DownloadMetadata) -> None:
+    """
+    Write the metadata for a downloaded file.
+
+    We write to a temporary file and then rename it, so we never leave
+    a half-written metadata file if we're interrupted.
+    """
+    tmp_path = path.with_suffix(".tmp")
+
+    with open(tmp_path, "w") as out_file:
+        json.dump(metadata, out_file)
+
+    tmp_path.replace(path)
+
+
+def _is_existing_file(path: Path, size: int) -> bool:
+    """
+    Returns True if there's a file of this size at ``path``.
+
+    This catches the case where somebody has deleted or modified
+    a file we downloaded, in which case we need to download it again,
+    even if it hasn't changed on the server.
+    """
+    try:
+        return path.stat().st_size == size
+    except FileNotFoundError:
+        return False
+
+
+def _parse_content_range(header: str | None) -> tuple[int, int | None] | None:
+    """
+    Parse a Content-Range header like ``bytes 100-199/1000``, and
+    return the first byte and the total size of the file, if known.
+    """
+    if header is None:
+        return None
+
+    m = re.fullmatch(r"bytes (?P<start>\d+)-\d+/(?P<total>\d+|\*)", header.strip())
+
+    if m is None:
+        return None
+
+    total = None if m.group("total") == "*" else int(m.group("total"))
+
+    return int(m.group("start")), total
+
+
+def _get_content_length(resp: httpx.Response) -> int | None:
+    """
+    Return the size of the response body, if the server told us.
+
+    We ignore the Content-Length header if the body is compressed
+    or chunked, because then it doesn't tell us how many bytes we'll
+    get from ``iter_bytes()``.
+    """
+    if "content-encoding" in resp.headers or "transfer-encoding" in resp.headers:
+        return None
+
+    try:
+        return int(resp.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
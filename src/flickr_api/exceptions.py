@@ -92,3 +92,16 @@ class PermissionDenied(FlickrApiException):
     """
     Thrown when you try to look up something you're not allowed to access.
     """
+
+
+class IncompleteDownload(Exception):
+    """
+    Thrown when we download a file from Flickr.com, but we don't
+    get the bytes we were expecting, e.g. the connection dropped
+    before we got the whole file.
+
+    This isn't an error from the Flickr API, so it isn't a subclass
+    of ``FlickrApiException``.
+    """
+
+    pass
@@ -1,7 +1,13 @@
 from datetime import datetime
 import typing
 
-from .contexts import AlbumContext, GalleryContext, GroupContext, PhotoContext
+from .contexts import (
+    AlbumContext,
+    ContextKind,
+    GalleryContext,
+    GroupContext,
+    PhotoContext,
+)
 from .licenses import assert_have_all_license_ids, License, LicenseId, LicenseChange
 from .machine_tags import MachineTags
 from .photo import (
@@ -24,6 +30,7 @@ __all__ = [
     "BoundingBox",
     "Comment",
     "CommonsInstitution",
+    "ContextKind",
     "DateTaken",
     "Editability",
     "ExifTag",
@@ -41,6 +48,7 @@ __all__ = [
     "NumericLocation",
     "Person",
     "PhotoContext",
+    "PhotoState",
     "ProfileInfo",
     "Rotation",
     "SafetyLevel",
@@ -105,6 +113,15 @@ SafetyLevel = typing.Literal["safe", "moderate", "restricted"]
 MediaType = typing.Literal["photo", "video"]
 
 
+# Whether a photo can be seen on Flickr.
+#
+# A "private" photo exists, but it's only visible to the owner and
+# (maybe) their friends and family.  Flickr only tells us a photo is
+# private if we're logged in as somebody who can see it -- to everybody
+# else, a private photo looks the same as one which doesn't exist.
+PhotoState = typing.Literal["exists", "not_found", "private"]
+
+
 class BoundingBox(typing.TypedDict):
     """
     A "bounding" box that highlights a specific region of a photo.
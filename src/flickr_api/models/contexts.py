@@ -74,6 +74,11 @@ class GroupContext(typing.TypedDict):
     count_members: int
 
 
+# The different kinds of context, which you can choose between when
+# calling ``get_photo_contexts()``.
+ContextKind = typing.Literal["albums", "galleries", "groups"]
+
+
 class PhotoContext(typing.TypedDict):
     """
     Places where a photo might appear on Flickr.com.
@@ -67,6 +67,101 @@ NAME_OVERRIDES = {
 }
 
 
+# A snapshot of the licenses returned by `flickr.photos.licenses.getInfo`,
+# organised by numeric ID.
+#
+# The list of licenses almost never changes, so we use this snapshot
+# rather than calling the API every time we create a new client.
+# We only call the API if we see a license that isn't in the snapshot.
+BUNDLED_LICENSES: dict[str, License] = {
+    "0": {
+        "id": "all-rights-reserved",
+        "label": "All Rights Reserved",
+        "url": "https://www.flickrhelp.com/hc/en-us/articles/10710266545556-Using-Flickr-images-shared-by-other-members",
+    },
+    "4": {
+        "id": "cc-by-2.0",
+        "label": "CC BY 2.0",
+        "url": "https://creativecommons.org/licenses/by/2.0/",
+    },
+    "6": {
+        "id": "cc-by-nd-2.0",
+        "label": "CC BY-ND 2.0",
+        "url": "https://creativecommons.org/licenses/by-nd/2.0/",
+    },
+    "3": {
+        "id": "cc-by-nc-nd-2.0",
+        "label": "CC BY-NC-ND 2.0",
+        "url": "https://creativecommons.org/licenses/by-nc-nd/2.0/",
+    },
+    "2": {
+        "id": "cc-by-nc-2.0",
+        "label": "CC BY-NC 2.0",
+        "url": "https://creativecommons.org/licenses/by-nc/2.0/",
+    },
+    "1": {
+        "id": "cc-by-nc-sa-2.0",
+        "label": "CC BY-NC-SA 2.0",
+        "url": "https://creativecommons.org/licenses/by-nc-sa/2.0/",
+    },
+    "5": {
+        "id": "cc-by-sa-2.0",
+        "label": "CC BY-SA 2.0",
+        "url": "https://creativecommons.org/licenses/by-sa/2.0/",
+    },
+    "7": {
+        "id": "nkcr",
+        "label": "No known copyright restrictions",
+        "url": "https://www.flickr.com/commons/usage/",
+    },
+    "8": {
+        "id": "usgov",
+        "label": "United States Government Work",
+        "url": "https://www.usa.gov/government-copyright",
+    },
+    "9": {
+        "id": "cc0-1.0",
+        "label": "CC0 1.0",
+        "url": "https://creativecommons.org/publicdomain/zero/1.0/",
+    },
+    "10": {
+        "id": "pdm",
+        "label": "Public Domain Mark",
+        "url": "https://creativecommons.org/publicdomain/mark/1.0/",
+    },
+    "11": {
+        "id": "cc-by-4.0",
+        "label": "CC BY 4.0",
+        "url": "https://creativecommons.org/licenses/by/4.0/",
+    },
+    "12": {
+        "id": "cc-by-sa-4.0",
+        "label": "CC BY-SA 4.0",
+        "url": "https://creativecommons.org/licenses/by-sa/4.0/",
+    },
+    "13": {
+        "id": "cc-by-nd-4.0",
+        "label": "CC BY-ND 4.0",
+        "url": "https://creativecommons.org/licenses/by-nd/4.0/",
+    },
+    "14": {
+        "id": "cc-by-nc-4.0",
+        "label": "CC BY-NC 4.0",
+        "url": "https://creativecommons.org/licenses/by-nc/4.0/",
+    },
+    "15": {
+        "id": "cc-by-nc-sa-4.0",
+        "label": "CC BY-NC-SA 4.0",
+        "url": "https://creativecommons.org/licenses/by-nc-sa/4.0/",
+    },
+    "16": {
+        "id": "cc-by-nc-nd-4.0",
+        "label": "CC BY-NC-ND 4.0",
+        "url": "https://creativecommons.org/licenses/by-nc-nd/4.0/",
+    },
+}
+
+
 class LicenseChangeEntry:
     """
     Events in the license history of a photo -- both the initial license
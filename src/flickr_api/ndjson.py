@@ -0,0 +1,110 @@
+"""
+Read and write API results as newline-delimited JSON (NDJSON).
+
+The models contain ``datetime`` values, which can't be stored in JSON
+directly.  We use the encoding from ``nitrate.json``, which stores them
+as ``{"type": "datetime.datetime", "value": "…"}`` and restores them
+when the JSON is read -- this is the same format as our test fixtures.
+
+You can write results to a file as you fetch them:
+
+    from flickr_api.ndjson import NdjsonWriter
+
+    with NdjsonWriter("comments.ndjson") as writer:
+        for photo_id in photo_ids:
+            writer.write_all(api.list_all_comments(photo_id=photo_id))
+
+and read them back later:
+
+    from flickr_api.models import Comment
+    from flickr_api.ndjson import read_ndjson
+
+    for comment in read_ndjson("comments.ndjson", model=Comment):
+        ...
+
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+import types
+import typing
+
+from nitrate.json import NitrateDecoder, NitrateEncoder
+
+
+__all__ = ["NdjsonWriter", "read_ndjson"]
+
+
+T = typing.TypeVar("T")
+
+
+class NdjsonWriter:
+    """
+    Write API results to a file as newline-delimited JSON, one record
+    per line.
+
+    Writes are buffered, and the same JSON encoder is reused for every
+    record, which is much faster than calling ``json.dumps()`` for
+    each record.
+    """
+
+    def __init__(self, path: str | Path, *, buffer_size: int = 1024 * 1024) -> None:
+        self._encoder = NitrateEncoder(
+            ensure_ascii=False, check_circular=False, separators=(",", ":")
+        )
+        self._out_file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+
+    def write(self, record: Mapping[str, object]) -> None:
+        """
+        Write a single record to the file.
+        """
+        self._out_file.write(self._encoder.encode(record))
+        self._out_file.write("\n")
+
+    def write_all(self, records: Iterable[Mapping[str, object]]) -> None:
+        """
+        Write a series of records to the file.
+        """
+        for r in records:
+            self.write(r)
+
+    def close(self) -> None:
+        """
+        Write any buffered records, and close the file.
+        """
+        self._out_file.close()
+
+    def __enter__(self) -> "NdjsonWriter":
+        """
+        Use the writer as a context manager, which closes the file on exit.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """
+        Close the file when the ``with`` block exits.
+        """
+        self.close()
+
+
+def read_ndjson(path: str | Path, *, model: type[T]) -> Iterator[T]:
+    """
+    Read records from a file written by ``NdjsonWriter``.
+
+    The records are read one at a time, so you can read very large
+    files without loading them into memory.
+
+    Note: for speed, this doesn't check the records match ``model``.
+    It's only meant for reading files written by ``NdjsonWriter``.
+    """
+    decoder = NitrateDecoder()
+
+    with open(path, encoding="utf-8") as in_file:
+        for line in in_file:
+            if line.strip():
+                yield typing.cast(T, decoder.decode(line))
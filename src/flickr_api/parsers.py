@@ -2,8 +2,9 @@
 Convert values from the Flickr API into nicely-typed values.
 """
 
-import collections
+from collections.abc import Iterable
 from datetime import datetime, timezone
+import functools
 import re
 import typing
 from xml.etree import ElementTree as ET
@@ -25,9 +26,11 @@ from .models import (
 
 __all__ = [
     "create_user",
+    "UserCache",
     "fix_realname",
     "parse_date_taken",
     "parse_machine_tags",
+    "parse_machine_tags_in_bulk",
     "parse_numeric_location",
     "parse_named_location",
     "parse_safety_level",
@@ -236,12 +239,20 @@ def create_user(
     realname: str | None,
     path_alias: str | None,
     is_deleted: bool = False,
+    *,
+    cache: "UserCache | None" = None,
 ) -> User:
     """
     Given some core attributes, construct a ``User`` object.
 
+    If you pass a ``cache``, you may get a ``User`` object which is
+    shared with other callers -- see ``UserCache``.
+
     This function is only intended for internal user.
     """
+    if cache is not None:
+        return cache.get_user(user_id, username, realname, path_alias, is_deleted)
+
     realname = fix_realname(user_id, username=username, realname=realname)
 
     # The Flickr API is a bit inconsistent about how some undefined attributes
@@ -264,6 +275,41 @@ def create_user(
         return user
 
 
+class UserCache:
+    """
+    A bounded cache of ``User`` objects.
+
+    The same users appear again and again in Flickr API responses, e.g.
+    a photo with 2,000 comments might only have 50 different commenters.
+    If you pass this cache to ``create_user``, it returns the same
+    ``User`` object every time it sees the same user, rather than
+    creating a new dict for every comment.
+
+    The ``User`` objects returned from this cache are shared, so
+    callers must not modify them.  If you want to change a user,
+    make a copy first, e.g. ``{**user, "realname": "…"}``.
+
+    When the cache is full, the least recently used users are discarded.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._create_user = functools.lru_cache(maxsize=maxsize)(create_user)
+
+    def get_user(
+        self,
+        user_id: str,
+        username: str,
+        realname: str | None,
+        path_alias: str | None,
+        is_deleted: bool = False,
+    ) -> User:
+        """
+        Return the ``User`` object for these attributes, creating it
+        if it isn't already in the cache.
+        """
+        return self._create_user(user_id, username, realname, path_alias, is_deleted)
+
+
 def fix_realname(user_id: str, username: str, realname: str | None) -> str | None:
     """
     Override the ``realname`` returned by the Flickr API.
@@ -317,6 +363,27 @@ MACHINE_TAG_RE = re.compile(
 )
 
 
+def _match_machine_tag(tag: str) -> tuple[str, str] | None:
+    """
+    If this tag is a machine tag, return a (namespace:predicate, value) pair.
+    Otherwise return ``None``.
+    """
+    # Almost all tags on Flickr are keyword tags with no colon, so
+    # we check for the separators before running the regex.  This is
+    # much cheaper than a failed regex match.
+    if ":" not in tag or "=" not in tag:
+        return None
+
+    if m := MACHINE_TAG_RE.match(tag):
+        namespace = m.group("namespace")
+        predicate = m.group("predicate")
+        value = m.group("value")
+
+        return (f"{namespace}:{predicate}", value)
+
+    return None
+
+
 def parse_machine_tags(tags: list[str]) -> MachineTags:
     """
     Given a list of raw tags on Flickr, parse the machine tags
@@ -340,17 +407,56 @@ def parse_machine_tags(tags: list[str]) -> MachineTags:
     not match Flickr perfectly, but is meant to make it easier for
     callers to work with machine tags.
     """
-    result: MachineTags = collections.defaultdict(list)
+    result: MachineTags = {}
 
     for t in tags:
-        if m := MACHINE_TAG_RE.match(t):
-            namespace = m.group("namespace")
-            predicate = m.group("predicate")
-            value = m.group("value")
+        if (match := _match_machine_tag(t)) is not None:
+            key, value = match
+
+            try:
+                result[key].append(value)
+            except KeyError:
+                result[key] = [value]
+
+    return result
+
+
+def parse_machine_tags_in_bulk(tag_lists: Iterable[list[str]]) -> list[MachineTags]:
+    """
+    Parse the machine tags for many photos at once.
+
+    This returns a list with one entry per list of tags, in the same
+    order, and each entry is the same as calling ``parse_machine_tags``
+    on that list of tags.
+
+    Example:
+
+        >>> parse_machine_tags_in_bulk([["square", "shape:sides=4"], ["sky"]])
+        [{"shape:sides": ["4"]}, {}]
+
+    The results share a single copy of each ``namespace:predicate``
+    key, rather than creating a new string for every photo, so they
+    use much less memory if you're parsing the tags on lots of photos.
+    """
+    keys: dict[str, str] = {}
+    result: list[MachineTags] = []
+
+    for tags in tag_lists:
+        machine_tags: MachineTags = {}
+
+        for t in tags:
+            if (match := _match_machine_tag(t)) is not None:
+                key, value = match
+                key = keys.setdefault(key, key)
+
+                try:
+                    machine_tags[key].append(value)
+                except KeyError:
+                    machine_tags[key] = [value]
 
-            result[f"{namespace}:{predicate}"].append(value)
+        result.append(machine_tags)
 
-    return dict(result)
+    return result
 
 
 def parse_rotation(rs: str) -> Rotation:
@@ -0,0 +1,59 @@
+"""
+Limit how quickly we do something, e.g. post comments to Flickr.
+
+If you post lots of comments in a short burst, Flickr will start
+throttling your requests.  The retry logic in the client will back off
+and try again, but it's better to avoid being throttled at all.
+"""
+
+import threading
+import time
+
+
+__all__ = ["RateLimiter"]
+
+
+class RateLimiter:
+    """
+    A thread-safe rate limiter, which allows up to ``rate`` units per
+    second on average, with bursts of up to ``burst`` units.
+
+    Call ``acquire()`` before doing something; it blocks until the
+    rate limit allows it to go ahead.
+
+    This is the "generic cell rate algorithm", which is equivalent
+    to a token bucket but only needs to track a single timestamp.
+    """
+
+    def __init__(self, rate: float, *, burst: float = 1) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+
+        if burst <= 0:
+            raise ValueError(f"burst must be positive: {burst}")
+
+        self.rate = rate
+        self.burst = burst
+
+        # The "theoretical arrival time": when the bucket would be full
+        # again if nobody used any more units.
+        self._tat = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        """
+        Wait until we're allowed to use ``amount`` units.
+
+        Callers are served in the order they call ``acquire()``.  Each
+        caller reserves its slot immediately and then sleeps outside
+        the lock, so one slow caller doesn't block the others.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now) + amount / self.rate
+            self._tat = tat
+
+        delay = tat - self.burst / self.rate - now
+
+        if delay > 0:
+            time.sleep(delay)
@@ -18,7 +18,11 @@ or if we should give up immediately.
 
 import httpx
 
-from .exceptions import InvalidXmlException, UnrecognisedFlickrApiException
+from .exceptions import (
+    IncompleteDownload,
+    InvalidXmlException,
+    UnrecognisedFlickrApiException,
+)
 
 
 __all__ = ["is_retryable"]
@@ -42,6 +46,7 @@ def is_retryable(exc: BaseException) -> bool:
             httpx.ReadError,
             httpx.ReadTimeout,
             httpx.RemoteProtocolError,
+            IncompleteDownload,
             InvalidXmlException,
         ),
     ):
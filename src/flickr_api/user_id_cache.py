@@ -0,0 +1,103 @@
+"""
+A persistent cache of user IDs, looked up from the path alias in
+a user's profile URL.
+
+If you pass ``get_user()`` or ``get_profile()`` a URL like
+https://www.flickr.com/photos/britishlibrary/, we have to call the
+``flickr.urls.lookupUser`` API to find out the user's NSID.  Path
+aliases rarely change, so we can remember the answer:
+
+    from flickr_api import FlickrApi
+    from flickr_api.user_id_cache import UserIdCache
+
+    api = FlickrApi.with_api_key(
+        api_key="…",
+        user_agent="…",
+        user_id_cache=UserIdCache("user_ids.db"),
+    )
+
+The cache is stored in an SQLite database, so it can be shared by
+multiple processes on the same machine.
+"""
+
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+import sqlite3
+import time
+
+
+__all__ = ["UserIdCache"]
+
+
+class UserIdCache:
+    """
+    A map from path alias to user ID, stored in an SQLite database.
+
+    Entries are ignored once they're older than ``ttl``, because a user
+    can change their path alias, and somebody else could then claim it.
+    """
+
+    def __init__(self, path: str | Path, *, ttl: timedelta = timedelta(days=30)):
+        self.path = path
+        self.ttl = ttl
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_ids ("
+                "  path_alias TEXT PRIMARY KEY,"
+                "  user_id TEXT NOT NULL,"
+                "  stored_at REAL NOT NULL"
+                ")"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a new connection to the database.
+
+        We open a connection for every operation rather than keeping one
+        open, because SQLite connections can't be shared between threads.
+        This is much cheaper than the API call we're saving.
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, path_alias: str) -> str | None:
+        """
+        Return the user ID for this path alias, or ``None`` if it isn't
+        in the cache or the entry has expired.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT user_id, stored_at FROM user_ids WHERE path_alias = ?",
+                (path_alias.lower(),),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        user_id, stored_at = row
+
+        if time.time() - stored_at >= self.ttl.total_seconds():
+            return None
+
+        assert isinstance(user_id, str)
+        return user_id
+
+    def set(self, path_alias: str, user_id: str) -> None:
+        """
+        Record the user ID for this path alias.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO user_ids VALUES (?, ?, ?)",
+                (path_alias.lower(), user_id, time.time()),
+            )
+
+    def delete(self, path_alias: str) -> None:
+        """
+        Remove this path alias from the cache, if it's there.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM user_ids WHERE path_alias = ?", (path_alias.lower(),)
+            )
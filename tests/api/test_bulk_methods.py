@@ -0,0 +1,73 @@
+"""
+Tests for the bulk methods, which call the Flickr API for many
+items at once.
+"""
+
+from collections.abc import Callable, Iterable
+import typing
+from unittest import mock
+
+import httpx
+import pytest
+
+from flickr_api import FlickrApi
+
+
+BulkMethod = Callable[[FlickrApi, Iterable[str]], typing.Any]
+
+
+BULK_METHODS = [
+    pytest.param(
+        lambda api, ids: api.get_license_histories(ids), id="get_license_histories"
+    ),
+    pytest.param(lambda api, ids: api.get_users(ids), id="get_users"),
+    pytest.param(lambda api, ids: api.get_photo_states(ids), id="get_photo_states"),
+    pytest.param(
+        lambda api, ids: api.get_exif_tags_for_photos(ids),
+        id="get_exif_tags_for_photos",
+    ),
+    pytest.param(
+        lambda api, ids: {
+            photo_id: result
+            for (photo_id, _), result in api.post_comments(
+                [(photo_id, "Hello world") for photo_id in ids], max_per_second=100
+            ).items()
+        },
+        id="post_comments",
+    ),
+]
+
+
+@pytest.mark.parametrize("bulk_method", BULK_METHODS)
+def test_transport_error_is_returned(
+    flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch, bulk_method: BulkMethod
+) -> None:
+    """
+    If a request fails with a transport error (e.g. a timeout),
+    you get the exception for that item, and the other items
+    are still fetched.
+    """
+    monkeypatch.setattr(
+        flickr_api,
+        "call",
+        mock.Mock(side_effect=httpx.ReadTimeout("The read operation timed out")),
+    )
+
+    results = dict(bulk_method(flickr_api, ["1", "2"]))
+
+    assert results.keys() == {"1", "2"}
+    assert all(isinstance(r, httpx.ReadTimeout) for r in results.values())
+
+
+@pytest.mark.parametrize("bulk_method", BULK_METHODS)
+def test_unexpected_error_is_raised(
+    flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch, bulk_method: BulkMethod
+) -> None:
+    """
+    If we get an error that isn't from Flickr or the network,
+    e.g. a bug in our code, it's raised rather than returned.
+    """
+    monkeypatch.setattr(flickr_api, "call", mock.Mock(side_effect=KeyError("photo")))
+
+    with pytest.raises(KeyError):
+        dict(bulk_method(flickr_api, ["1", "2"]))
@@ -2,11 +2,21 @@
 Tests for ``flickr_api.api.comment_methods``.
 """
 
+from datetime import datetime, timezone
+from unittest import mock
+from xml.etree import ElementTree as ET
+
 from authlib.integrations.httpx_client import OAuth1Client
 import httpx
 import pytest
 
-from flickr_api import FlickrApi, InsufficientPermissionsToComment
+from flickr_api import (
+    FlickrApi,
+    InsufficientPermissionsToComment,
+    ResourceNotFound,
+    UnrecognisedFlickrApiException,
+)
+from flickr_api.parsers import UserCache
 
 
 class TestListAllComments:
@@ -52,6 +62,120 @@ class TestListAllComments:
 
         assert comments[0]["author"]["realname"] is None
 
+    def test_shares_users_with_user_cache(self, flickr_api: FlickrApi) -> None:
+        """
+        If the API has a ``UserCache``, comments by the same author
+        share a single ``User`` object.
+        """
+        flickr_api.user_cache = UserCache()
+
+        comments = flickr_api.list_all_comments(photo_id="2960116125")
+
+        authors = {id(c["author"]) for c in comments}
+        author_ids = {c["author"]["id"] for c in comments}
+
+        assert len(comments) == 1329
+        assert len(authors) == len(author_ids)
+
+
+class TestListCommentsSince:
+    """
+    Tests for ``CommentMethods.list_comments_since()``.
+    """
+
+    # This is the response to ``flickr.photos.comments.getList`` for
+    # photo 40373414385, which has a single comment.
+    comments_resp = ET.fromstring(
+        '<rsp stat="ok">'
+        '<comments photo_id="40373414385">'
+        '<comment id="47181064-40373414385-72157695033805211" '
+        'author="47201412@N02" author_is_deleted="0" authorname="pellethepoet" '
+        'iconserver="2683" iconfarm="3" datecreate="1526221240" '
+        'permalink="https://www.flickr.com/photos/pellethepoet/40373414385/#comment72157695033805211" '
+        'path_alias="pellethepoet" realname="">'
+        "[https://www.flickr.com/photos/pellethepoet/sets/72157693630234402]"
+        "</comment>"
+        "</comments>"
+        "</rsp>"
+    )
+
+    @pytest.mark.parametrize(
+        ["until", "expected_params"],
+        [
+            (None, {"min_comment_date": 1526220000}),
+            (
+                datetime(2018, 5, 14, tzinfo=timezone.utc),
+                {"min_comment_date": 1526220000, "max_comment_date": 1526256000},
+            ),
+        ],
+    )
+    def test_passes_comment_dates_to_api(
+        self,
+        flickr_api: FlickrApi,
+        monkeypatch: pytest.MonkeyPatch,
+        until: datetime | None,
+        expected_params: dict[str, int],
+    ) -> None:
+        """
+        The ``since`` and ``until`` dates are passed to the API as
+        Unix timestamps.
+        """
+        call = mock.Mock(return_value=self.comments_resp)
+        monkeypatch.setattr(flickr_api, "call", call)
+
+        comments = flickr_api.list_comments_since(
+            photo_id="40373414385",
+            since=datetime(2018, 5, 13, 14, 0, 0, tzinfo=timezone.utc),
+            until=until,
+        )
+
+        assert call.call_args.kwargs["params"] == {
+            "photo_id": "40373414385",
+            **expected_params,
+        }
+        assert [c["id"] for c in comments] == ["47181064-40373414385-72157695033805211"]
+        assert comments[0]["date"] == datetime(
+            2018, 5, 13, 14, 20, 40, tzinfo=timezone.utc
+        )
+
+    def test_naive_datetime_is_error(self, flickr_api: FlickrApi) -> None:
+        """
+        You can't pass a datetime without a timezone, because we don't
+        know what timestamp it refers to.
+        """
+        with pytest.raises(ValueError, match="must be timezone-aware"):
+            flickr_api.list_comments_since(
+                photo_id="40373414385", since=datetime(2018, 5, 13)
+            )
+
+
+class TestIterCommentsForPhotos:
+    """
+    Tests for ``CommentMethods.iter_comments_for_photos()``.
+    """
+
+    def test_gets_comments_for_all_photos(self, flickr_api: FlickrApi) -> None:
+        """
+        It gets all the comments on every photo, and the comments on
+        each photo are kept together in order.
+        """
+        photo_ids = ["12584715825", "3334095096", "40373414385"]
+
+        comments = list(flickr_api.iter_comments_for_photos(photo_ids))
+
+        assert len(comments) == 154 + 376 + 1
+
+        for photo_id in photo_ids:
+            comment_dates = [c["date"] for c in comments if c["photo_id"] == photo_id]
+            assert comment_dates == sorted(comment_dates)
+
+    def test_throws_if_photo_does_not_exist(self, flickr_api: FlickrApi) -> None:
+        """
+        If one of the photos doesn't exist, it throws ``ResourceNotFound``.
+        """
+        with pytest.raises(ResourceNotFound):
+            list(flickr_api.iter_comments_for_photos(["12584715825", "1"]))
+
 
 class TestPostComment:
     """
@@ -107,3 +231,81 @@ class TestPostComment:
                 photo_id="53374767803",
                 comment_text="This is a comment that uses bogus OAuth 1.0a credentials",
             )
+
+
+class TestPostComments:
+    """
+    Tests for ``CommentMethods.post_comments``.
+    """
+
+    def test_post_comments(self, flickr_oauth_api: FlickrApi) -> None:
+        """
+        You can post a batch of comments.  Duplicate comments are only
+        posted once, and if you can't comment on a photo, the error is
+        returned for that comment.
+
+        The cassette for this test only has one successful POST, so
+        this would fail if we posted the duplicate comment.
+        """
+        allowed = (
+            "53373661077",
+            "This is a comment posted by the Flickypedia unit tests",
+        )
+        not_allowed = (
+            "53374767803",
+            "This is a comment on a photo where I’ve disabled commenting",
+        )
+
+        result = flickr_oauth_api.post_comments(
+            [allowed, not_allowed, allowed], max_per_second=100
+        )
+
+        assert result.keys() == {allowed, not_allowed}
+        assert isinstance(result[allowed], str)
+        assert isinstance(result[not_allowed], InsufficientPermissionsToComment)
+
+    def test_returns_other_errors(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If there's an unexpected error posting a comment, it's returned
+        for that comment, and the other comments are still posted.
+        """
+        error = UnrecognisedFlickrApiException({"code": "6", "msg": "Mysterious error"})
+
+        def post_comment(*, photo_id: str, comment_text: str) -> str:
+            """
+            Fail for one photo, and succeed for the other.
+            """
+            if photo_id == "53373661077":
+                raise error
+            return "comment-" + photo_id
+
+        monkeypatch.setattr(flickr_api, "post_comment", post_comment)
+
+        result = flickr_api.post_comments(
+            [("53373661077", "Hello world"), ("53374767803", "Hello world")],
+            max_per_second=100,
+        )
+
+        assert result == {
+            ("53373661077", "Hello world"): error,
+            ("53374767803", "Hello world"): "comment-53374767803",
+        }
+
+    def test_checks_photo_ids_before_posting(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If any of the photo IDs are invalid, we throw a ``ValueError``
+        before posting any comments.
+        """
+        post_comment = mock.Mock(return_value="12345")
+        monkeypatch.setattr(flickr_api, "post_comment", post_comment)
+
+        with pytest.raises(ValueError, match="Not a Flickr photo ID"):
+            flickr_api.post_comments(
+                [("53373661077", "Hello world"), ("-1", "Hello world")]
+            )
+
+        post_comment.assert_not_called()
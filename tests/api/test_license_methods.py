@@ -2,11 +2,19 @@
 Tests for ``flickr_api.api.licenses``.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import gc
+import threading
+import typing
+from unittest import mock
+import weakref
 
 import pytest
 
 from flickr_api import FlickrApi, LicenseNotFound, ResourceNotFound
+from flickr_api.api.license_methods import LicenseRegistry
+from flickr_api.models.licenses import BUNDLED_LICENSES
 
 
 class TestLicenseMethods:
@@ -137,6 +145,108 @@ class TestLicenseMethods:
         with pytest.raises(LicenseNotFound, match=bad_id):
             flickr_api.lookup_license_by_id(id=bad_id)
 
+    def test_lookups_use_bundled_licenses(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Looking up a known license uses the bundled snapshot, and
+        doesn't call the API.
+        """
+        call = mock.Mock()
+        monkeypatch.setattr(flickr_api, "call", call)
+
+        assert flickr_api.lookup_license_by_id(id="4")["id"] == "cc-by-2.0"
+        assert flickr_api.lookup_license_by_id(id="nkcr")["label"] == (
+            "No known copyright restrictions"
+        )
+        call.assert_not_called()
+
+    def test_bundled_licenses_match_api(self, flickr_api: FlickrApi) -> None:
+        """
+        The bundled snapshot of licenses is the same as the list
+        returned by the API.
+        """
+        assert flickr_api.refresh_licenses() == BUNDLED_LICENSES
+        assert flickr_api.get_licenses() == BUNDLED_LICENSES
+
+    def test_licenses_are_not_shared_between_clients(
+        self, flickr_api: FlickrApi
+    ) -> None:
+        """
+        Modifying the licenses returned by one client doesn't affect
+        another client, or the bundled snapshot.
+        """
+        other_api = FlickrApi.with_api_key(api_key="<KEY>", user_agent="<USER_AGENT>")
+        licenses = flickr_api.get_licenses()
+
+        assert licenses is not BUNDLED_LICENSES
+
+        licenses["4"]["label"] = "My favourite license"
+        del licenses["0"]
+
+        assert other_api.get_licenses() == BUNDLED_LICENSES
+        assert BUNDLED_LICENSES["4"]["label"] == "CC BY 2.0"
+        assert "0" in BUNDLED_LICENSES
+
+    def test_fetches_licenses_missing_from_snapshot(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If you look up a license which isn't in the snapshot, the client
+        fetches the latest list of licenses from the API.
+        """
+        monkeypatch.setattr(flickr_api, "_license_registry", LicenseRegistry({}))
+
+        assert flickr_api.lookup_license_by_id(id="0")["id"] == "all-rights-reserved"
+
+    def test_only_fetches_licenses_once(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If multiple threads look up unknown licenses at the same time,
+        the list of licenses is only fetched from the API once.
+        """
+        call_count = 0
+        original_call = flickr_api.call
+        barrier = threading.Barrier(8)
+
+        def counting_call(**kwargs: typing.Any) -> typing.Any:
+            """
+            Count how many times we call the Flickr API.
+            """
+            nonlocal call_count
+            call_count += 1
+            return original_call(**kwargs)
+
+        monkeypatch.setattr(flickr_api, "call", counting_call)
+
+        def lookup(id: str) -> None:
+            """
+            Look up a license which isn't in the bundled snapshot.
+            """
+            barrier.wait()
+            with pytest.raises(LicenseNotFound):
+                flickr_api.lookup_license_by_id(id=id)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lookup, ["100", "cc-by-5.0"] * 4))
+
+        assert call_count == 1
+
+    def test_does_not_keep_clients_alive(self, flickr_api: FlickrApi) -> None:
+        """
+        Looking up licenses doesn't keep a reference to the client,
+        so it can be garbage collected when it's no longer used.
+        """
+        api = FlickrApi(client=flickr_api.client)
+        assert api.lookup_license_by_id(id="0")["id"] == "all-rights-reserved"
+
+        api_ref = weakref.ref(api)
+        del api
+        gc.collect()
+
+        assert api_ref() is None
+
 
 class TestGetLicenseHistory:
     """
@@ -223,6 +333,34 @@ class TestGetLicenseHistory:
 
         assert expected == actual
 
+    def test_fetches_license_urls_missing_from_snapshot(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If the license history includes a license URL which isn't in
+        the snapshot, the client fetches the latest list of licenses.
+        """
+        monkeypatch.setattr(flickr_api, "_license_registry", LicenseRegistry({}))
+
+        history = flickr_api.get_license_history(photo_id="3948976954")
+
+        assert history[0]["license"]["id"] == "nkcr"  # type: ignore[typeddict-item]
+
+    def test_unknown_license_url_is_error(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If the license history includes a license URL which isn't in
+        the latest list of licenses, you get a ``LicenseNotFound`` error.
+        """
+        monkeypatch.setattr(flickr_api, "_license_registry", LicenseRegistry({}))
+        monkeypatch.setattr(flickr_api, "_fetch_licenses", lambda: {})
+
+        with pytest.raises(
+            LicenseNotFound, match="https://www.flickr.com/commons/usage/"
+        ):
+            flickr_api.get_license_history(photo_id="3948976954")
+
     @pytest.mark.parametrize(
         "photo_id", ["does_not_exist", "12345678901234567890", "-1"]
     )
@@ -235,3 +373,33 @@ class TestGetLicenseHistory:
         """
         with pytest.raises(ResourceNotFound):
             flickr_api.get_license_history(photo_id)
+
+
+class TestGetLicenseHistories:
+    """
+    Tests for ``get_license_histories``.
+    """
+
+    def test_get_license_histories(self, flickr_api: FlickrApi) -> None:
+        """
+        You can get the license history of multiple photos at once,
+        and if a photo doesn't exist, you get an exception for that photo.
+        """
+        photo_ids = ["3948976954", "54049228596", "does_not_exist"]
+
+        histories = dict(flickr_api.get_license_histories(photo_ids))
+
+        assert histories.keys() == set(photo_ids)
+        assert histories["3948976954"] == [
+            {
+                "date_posted": datetime(2009, 9, 23, 21, 36, 56, tzinfo=timezone.utc),
+                "license": {
+                    "id": "nkcr",
+                    "label": "No known copyright restrictions",
+                    "url": "https://www.flickr.com/commons/usage/",
+                },
+            }
+        ]
+        assert isinstance(histories["54049228596"], list)
+        assert len(histories["54049228596"]) == 1
+        assert isinstance(histories["does_not_exist"], ResourceNotFound)
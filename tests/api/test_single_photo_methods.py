@@ -2,7 +2,11 @@
 Tests for ``flickr_api.api.single_photo_methods``.
 """
 
+from collections.abc import Mapping
 from datetime import datetime, timezone
+import typing
+from unittest import mock
+from xml.etree import ElementTree as ET
 
 import pytest
 
@@ -527,6 +531,46 @@ class TestIsPhotoDeleted:
             flickr_api.get_single_photo(photo_id="16062734376")
 
 
+class TestGetPhotoStates:
+    """
+    Tests for ``SinglePhotoMethods.get_photo_states()``.
+    """
+
+    def test_get_photo_states(self, flickr_api: FlickrApi) -> None:
+        """
+        You can check whether many photos exist at once.
+
+        Note that a private photo looks the same as a non-existent
+        photo, because we aren't logged in as the owner.
+        """
+        states = dict(
+            flickr_api.get_photo_states(["53509656752", "16062734376", "35366357641"])
+        )
+
+        assert states == {
+            "53509656752": "exists",
+            "16062734376": "not_found",
+            "35366357641": "not_found",
+        }
+
+    def test_private_photo(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If we can see a photo but it isn't public, it's private.
+        """
+        call = mock.Mock(
+            return_value=ET.fromstring(
+                '<rsp stat="ok"><photo id="35366357641">'
+                '<visibility ispublic="0" isfriend="1" isfamily="0"/>'
+                "</photo></rsp>"
+            )
+        )
+        monkeypatch.setattr(flickr_api, "call", call)
+
+        assert flickr_api.get_photo_state(photo_id="35366357641") == "private"
+
+
 class TestGetPhotoContexts:
     """
     Tests for ``SinglePhotoMethods.get_photo_contexts()``.
@@ -610,6 +654,108 @@ class TestGetPhotoContexts:
             "count_members": 43105,
         }
 
+    def test_only_gets_albums_and_groups(self, flickr_api: FlickrApi) -> None:
+        """
+        If you only ask for albums, we don't fetch the galleries.
+
+        The cassette for this test only has the ``getAllContexts`` call,
+        so this would fail if we called the galleries API.
+        """
+        contexts = flickr_api.get_photo_contexts(
+            photo_id="51800056877", include=["albums"]
+        )
+
+        assert len(contexts["albums"]) == 3
+        assert contexts["galleries"] == []
+        assert contexts["groups"] == []
+
+    def test_only_gets_galleries(self, flickr_api: FlickrApi) -> None:
+        """
+        If you only ask for galleries, we don't call ``getAllContexts``.
+
+        The cassette for this test only has the galleries call,
+        so this would fail if we called ``getAllContexts``.
+        """
+        contexts = flickr_api.get_photo_contexts(
+            photo_id="53563844904", include=["galleries"]
+        )
+
+        assert contexts["albums"] == []
+        assert len(contexts["galleries"]) == 11
+        assert contexts["groups"] == []
+
+    def test_gets_nothing_if_no_contexts_requested(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If you don't ask for any contexts, we don't call the API.
+        """
+        call = mock.Mock()
+        monkeypatch.setattr(flickr_api, "call", call)
+
+        contexts = flickr_api.get_photo_contexts(photo_id="53563844904", include=[])
+
+        assert contexts == {"albums": [], "galleries": [], "groups": []}
+        call.assert_not_called()
+
+    def test_unrecognised_context_kind_is_error(self, flickr_api: FlickrApi) -> None:
+        """
+        If you ask for a kind of context we don't know about, you get
+        a ``ValueError``.
+        """
+        with pytest.raises(ValueError, match="Unrecognised context kinds"):
+            flickr_api.get_photo_contexts(
+                photo_id="53563844904",
+                include=["albums", "photostream"],  # type: ignore[list-item]
+            )
+
+    def test_gets_multiple_pages_of_galleries(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If a photo is in more galleries than fit on a single page,
+        we fetch every page, and return the galleries in order.
+        """
+        # We don't have a photo in enough galleries to record a real
+        # response, so we use fake responses with 3 galleries per page.
+        pages = 4
+
+        def call(
+            *, method: str, params: Mapping[str, str | int], **kwargs: typing.Any
+        ) -> ET.Element:
+            """
+            Return a fake response for each page of galleries.
+            """
+            if method == "flickr.photos.getAllContexts":
+                return ET.fromstring('<rsp stat="ok"/>')
+
+            page = int(params.get("page", 1))
+            gallery_elems = "".join(
+                f'<gallery gallery_id="{page}-{i}" '
+                f'url="https://www.flickr.com/photos/example/galleries/{page}-{i}" '
+                'owner="12345678@N01" username="example" '
+                'date_create="1680980061" date_update="1714564015" '
+                'count_photos="1" count_videos="0" '
+                'count_views="0" count_comments="0">'
+                "<title>Gallery</title><description/>"
+                "</gallery>"
+                for i in range(3)
+            )
+            return ET.fromstring(
+                f'<rsp stat="ok"><galleries page="{page}" pages="{pages}">'
+                f"{gallery_elems}"
+                "</galleries></rsp>"
+            )
+
+        monkeypatch.setattr(flickr_api, "call", call)
+
+        contexts = flickr_api.get_photo_contexts(photo_id="53563844904")
+
+        assert [g["id"] for g in contexts["galleries"]] == [
+            f"{page}-{i}" for page in range(1, pages + 1) for i in range(3)
+        ]
+        assert contexts["galleries"][0]["owner"]["path_alias"] == "example"
+
 
 class TestPrivatePhotos:
     """
@@ -716,3 +862,52 @@ class TestGetExif:
         """
         with pytest.raises(ResourceNotFound):
             flickr_api.get_exif_tags_for_photo(photo_id=photo_id)
+
+
+class TestGetExifForPhotos:
+    """
+    Tests for `SinglePhotoMethods.get_exif_tags_for_photos`.
+    """
+
+    def test_get_exif_for_photos(self, flickr_api: FlickrApi) -> None:
+        """
+        Get the EXIF data for multiple photos, indexed by tagspace and tag.
+        """
+        exif = dict(
+            flickr_api.get_exif_tags_for_photos(
+                ["283148152", "54159643533", "54208962452"]
+            )
+        )
+
+        assert exif.keys() == {"283148152", "54159643533", "54208962452"}
+
+        assert isinstance(exif["283148152"], dict)
+        assert len(exif["283148152"]) == 5
+        assert exif["283148152"][("JFIF", "JFIFVersion")]["raw_value"] == "1.02"
+
+        assert isinstance(exif["54159643533"], dict)
+        assert len(exif["54159643533"]) == 43
+        assert exif["54159643533"][("IFD0", "XResolution")] == {
+            "tagspace": "IFD0",
+            "tagspaceid": "0",
+            "tag": "XResolution",
+            "label": "X-Resolution",
+            "raw_value": "72",
+            "clean_value": "72 dpi",
+        }
+
+        assert isinstance(exif["54208962452"], PermissionDenied)
+
+    def test_only_gets_selected_tags(self, flickr_api: FlickrApi) -> None:
+        """
+        If you pass a list of tags, only those tags are returned.
+        """
+        exif = dict(
+            flickr_api.get_exif_tags_for_photos(
+                ["54159643533"],
+                tags=[("IFD0", "Make"), ("IFD0", "Model"), ("GPS", "GPSLatitude")],
+            )
+        )
+
+        assert isinstance(exif["54159643533"], dict)
+        assert exif["54159643533"].keys() == {("IFD0", "Make"), ("IFD0", "Model")}
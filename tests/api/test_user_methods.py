@@ -4,7 +4,9 @@ Tests for ``flickr_api.api.user_methods``.
 
 from collections.abc import Mapping
 from datetime import datetime, timezone
+from pathlib import Path
 import typing
+from unittest import mock
 from xml.etree import ElementTree as ET
 
 import pytest
@@ -17,6 +19,8 @@ from flickr_api import (
     UserDeleted,
 )
 from flickr_api.api.user_methods import UserMethods
+from flickr_api.models import UserInfo
+from flickr_api.user_id_cache import UserIdCache
 
 
 class TestGetUser:
@@ -400,3 +404,217 @@ class TestGetProfile:
         """
         with pytest.raises(ResourceNotFound):
             flickr_oauth_api.get_profile(user_id="does_not_exist")
+
+
+class TestGetUsers:
+    """
+    Tests for ``UserMethods.get_users``.
+    """
+
+    def test_get_users(self, flickr_api: FlickrApi) -> None:
+        """
+        You can look up a mix of user IDs and URLs, and each user is
+        only fetched once.
+
+        The cassette for this test only has one ``flickr.people.getInfo``
+        call for the British Library, so this would fail if we looked
+        them up twice.
+        """
+        users = [
+            "12403504@N02",
+            "https://www.flickr.com/photos/britishlibrary/",
+            FlickrUserIds.Alexwlchan,
+            "https://www.flickr.com/photos/199246608@N02",
+            FlickrUserIds.Deleted,
+            "12403504@N02",
+        ]
+
+        result = flickr_api.get_users(users)
+
+        assert list(result.keys()) == users[:-1]
+
+        assert result["12403504@N02"]["username"] == "The British Library"  # type: ignore[index]
+        assert (
+            result["https://www.flickr.com/photos/britishlibrary/"]
+            == (result["12403504@N02"])
+        )
+        assert result[FlickrUserIds.Alexwlchan]["username"] == "alexwlchan"  # type: ignore[index]
+        assert result["https://www.flickr.com/photos/199246608@N02"]["id"] == (  # type: ignore[index]
+            "199246608@N02"
+        )
+        assert isinstance(result[FlickrUserIds.Deleted], UserDeleted)
+
+    def test_records_unresolvable_urls(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        If we can't look up the user ID for a URL, the exception is
+        recorded for that URL.  If the user ID points to a deleted user,
+        the path alias is removed from the user ID cache.
+        """
+
+        def lookup_user_id_for_user_url(*, user_url: str) -> str:
+            """
+            Pretend this URL doesn't belong to any user.
+            """
+            raise ResourceNotFound(f"Could not find user with URL: {user_url!r}")
+
+        monkeypatch.setattr(
+            flickr_api, "_lookup_user_id_for_user_url", lookup_user_id_for_user_url
+        )
+
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+        flickr_api.user_id_cache.set("example", FlickrUserIds.Deleted)
+
+        result = flickr_api.get_users(
+            [
+                "https://www.flickr.com/photos/doesnotexist/",
+                "https://www.flickr.com/photos/example/",
+            ]
+        )
+
+        assert isinstance(
+            result["https://www.flickr.com/photos/doesnotexist/"], ResourceNotFound
+        )
+        assert isinstance(result["https://www.flickr.com/photos/example/"], UserDeleted)
+        assert flickr_api.user_id_cache.get("example") is None
+
+    def test_records_non_user_urls(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        If a URL isn't a link to a user, the ``ValueError`` is recorded
+        for that URL, and the other users are still looked up.
+        """
+        photo_url = "https://www.flickr.com/photos/britishlibrary/11308208223/"
+        user_info = typing.cast(UserInfo, {"id": "12403504@N02"})
+
+        monkeypatch.setattr(flickr_api, "_get_user", mock.Mock(return_value=user_info))
+
+        result = flickr_api.get_users([photo_url, "12403504@N02"])
+
+        assert isinstance(result[photo_url], ValueError)
+        assert result["12403504@N02"] == user_info
+
+
+class TestGetUserWithProfile:
+    """
+    Tests for ``UserMethods.get_user_with_profile``.
+    """
+
+    def test_get_user_with_profile(self, flickr_oauth_api: FlickrApi) -> None:
+        """
+        You can get a user's info and profile together, and the user ID
+        is only looked up once.
+        """
+        user, profile = flickr_oauth_api.get_user_with_profile(
+            user_url="https://www.flickr.com/photos/flickrfoundation/"
+        )
+
+        assert user["id"] == "197130754@N07"
+        assert user["username"] == "Flickr Foundation"
+        assert profile["id"] == "197130754@N07"
+        assert profile["email"] == "hello@flickr.org"
+
+    def test_get_deleted_user_with_profile(
+        self, flickr_api: FlickrApi, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        If the user has been deleted, you get a ``UserDeleted`` error,
+        and their path alias is removed from the user ID cache.
+        """
+        # The profile API still returns information about deleted users,
+        # but we don't have a recorded response for this user.
+        monkeypatch.setattr(flickr_api, "_get_profile", mock.Mock())
+
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+        flickr_api.user_id_cache.set("example", FlickrUserIds.Deleted)
+
+        with pytest.raises(UserDeleted):
+            flickr_api.get_user_with_profile(
+                user_url="https://www.flickr.com/photos/example/"
+            )
+
+        assert flickr_api.user_id_cache.get("example") is None
+
+
+class TestUserIdCache:
+    """
+    Tests for looking up users by URL with a ``UserIdCache``.
+    """
+
+    def test_saves_user_id_for_url(self, flickr_api: FlickrApi, tmp_path: Path) -> None:
+        """
+        If you look up a user by URL, their user ID is saved in the cache.
+        """
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+
+        user = flickr_api.get_user(
+            user_url="https://www.flickr.com/photos/britishlibrary/"
+        )
+
+        assert user["id"] == "12403504@N02"
+        assert flickr_api.user_id_cache.get("britishlibrary") == "12403504@N02"
+
+    def test_uses_cached_user_id(self, flickr_api: FlickrApi, tmp_path: Path) -> None:
+        """
+        If the path alias is already in the cache, we don't call
+        ``flickr.urls.lookupUser``.
+
+        The cassette for this test only has the ``flickr.people.getInfo``
+        call, so this would fail if we called the API.
+        """
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+        flickr_api.user_id_cache.set("britishlibrary", "12403504@N02")
+
+        user = flickr_api.get_user(
+            user_url="https://www.flickr.com/photos/britishlibrary/"
+        )
+
+        assert user["id"] == "12403504@N02"
+
+    def test_forgets_deleted_user(self, flickr_api: FlickrApi, tmp_path: Path) -> None:
+        """
+        If a cached user ID points to a deleted user, it's removed
+        from the cache.
+        """
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+        flickr_api.user_id_cache.set("example", FlickrUserIds.Deleted)
+
+        with pytest.raises(UserDeleted):
+            flickr_api.get_user(user_url="https://www.flickr.com/photos/example/")
+
+        assert flickr_api.user_id_cache.get("example") is None
+
+    def test_user_id_url_is_not_cached(
+        self, flickr_api: FlickrApi, tmp_path: Path
+    ) -> None:
+        """
+        If the URL already contains the user ID, nothing is saved in
+        the cache.
+        """
+        flickr_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+
+        with pytest.raises(UserDeleted):
+            flickr_api.get_user(
+                user_url=f"https://www.flickr.com/photos/{FlickrUserIds.Deleted}/"
+            )
+
+        assert flickr_api.user_id_cache.get(FlickrUserIds.Deleted) is None
+
+    def test_forgets_nonexistent_profile(
+        self, flickr_oauth_api: FlickrApi, tmp_path: Path
+    ) -> None:
+        """
+        If a cached user ID points to a profile which doesn't exist,
+        it's removed from the cache.
+        """
+        flickr_oauth_api.user_id_cache = UserIdCache(tmp_path / "user_ids.db")
+        flickr_oauth_api.user_id_cache.set("example", "does_not_exist")
+
+        with pytest.raises(ResourceNotFound):
+            flickr_oauth_api.get_profile(
+                user_url="https://www.flickr.com/photos/example/"
+            )
+
+        assert flickr_oauth_api.user_id_cache.get("example") is None
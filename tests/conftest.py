@@ -2,8 +2,57 @@
 Fixtures and utilities to use in the tests.
 """
 
+import functools
+import threading
+import typing
+
 from flickr_api.fixtures import flickr_api, flickr_oauth_api
-from nitrate.cassettes import cassette_name, vcr_cassette
+import httpx
+from nitrate.cassettes import get_cassette_name, vcr_cassette
+import pytest
 
 
 __all__ = ["cassette_name", "flickr_api", "flickr_oauth_api", "vcr_cassette"]
+
+
+@pytest.fixture
+def thread_safe_vcr_playback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Make it safe to replay cassettes from multiple threads at once,
+    which we do when testing the bulk methods.
+
+    When vcr.py replays a response, it briefly replaces
+    ``httpx.Response.read`` with a mock, for every thread.  If another
+    thread reads a response at the same moment, it gets the mock and
+    fails with a confusing error, e.g. ``httpx.ResponseNotRead``.
+    We add a lock, so only one thread sends a request at a time.
+
+    This serialises every request, so it would hide concurrency bugs
+    in tests which don't use cassettes -- only use it with cassettes.
+    """
+    lock = threading.Lock()
+    send = httpx.Client.send
+
+    @functools.wraps(send)
+    def locked_send(*args: typing.Any, **kwargs: typing.Any) -> httpx.Response:
+        """
+        Send a request, while holding the lock.
+        """
+        with lock:
+            return send(*args, **kwargs)
+
+    monkeypatch.setattr(httpx.Client, "send", locked_send)
+
+
+@pytest.fixture
+def cassette_name(
+    request: pytest.FixtureRequest, thread_safe_vcr_playback: None
+) -> str:
+    """
+    Returns the filename of a VCR cassette to use in tests.
+
+    Every test which replays a cassette uses this fixture (including
+    through ``flickr_api`` and ``vcr_cassette``), so this is where we
+    opt in to ``thread_safe_vcr_playback``.
+    """
+    return get_cassette_name(request)
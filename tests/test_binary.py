@@ -0,0 +1,195 @@
+"""
+Tests for ``flickr_api.binary``.
+"""
+
+from datetime import datetime, timedelta, timezone
+import io
+import json
+import typing
+
+from nitrate.json import NitrateEncoder
+import msgpack
+import pytest
+
+from flickr_api import FlickrApi
+from flickr_api.binary import BinaryDecoder, BinaryEncoder, dumps, loads
+
+
+@pytest.fixture
+def cassette_name(
+    request: pytest.FixtureRequest, thread_safe_vcr_playback: None
+) -> str:
+    """
+    Reuse the cassettes from the NDJSON round-trip tests, which make
+    the same API calls.
+    """
+    return f"{request.node.name}.yml"
+
+
+class TestBinaryCodec:
+    """
+    Tests that API results survive a round trip through the binary codec.
+    """
+
+    def test_round_trip_single_photo(self, flickr_api: FlickrApi) -> None:
+        """
+        A photo can be encoded and decoded, including naive and
+        UTC datetimes.
+        """
+        photo = flickr_api.get_single_photo(photo_id="32812033543")
+        decoded = loads(dumps(photo))
+
+        assert decoded == photo
+        assert decoded["date_posted"].tzinfo == timezone.utc
+        assert decoded["date_taken"]["value"].tzinfo is None
+
+    def test_round_trip_comments(self, flickr_api: FlickrApi) -> None:
+        """
+        Comments can be encoded and decoded, and the encoding is smaller
+        than JSON.
+        """
+        comments = flickr_api.list_all_comments(photo_id="40373414385")
+
+        encoded = dumps(comments)
+
+        assert loads(encoded) == comments
+        assert len(encoded) < len(json.dumps(comments, cls=NitrateEncoder))
+
+    def test_round_trip_license_history(self, flickr_api: FlickrApi) -> None:
+        """
+        A license history can be encoded and decoded.
+        """
+        history = flickr_api.get_license_history(photo_id="54450311696")
+
+        assert loads(dumps(history)) == history
+
+    def test_round_trip_photo_contexts(self, flickr_api: FlickrApi) -> None:
+        """
+        The contexts of a photo can be encoded and decoded.
+        """
+        contexts = flickr_api.get_photo_contexts(photo_id="53563844904")
+
+        assert loads(dumps(contexts)) == contexts
+
+
+def test_shared_values_are_shared_across_a_stream() -> None:
+    """
+    If you encode a series of records with a single encoder, each
+    license is only stored once, and the decoded records share it.
+    """
+    license = {
+        "id": "cc-by-2.0",
+        "label": "CC BY 2.0",
+        "url": "https://creativecommons.org/licenses/by/2.0/",
+    }
+    records = [{"id": str(i), "license": license} for i in range(3)]
+
+    encoder = BinaryEncoder()
+    stream = io.BytesIO(b"".join(encoder.encode(r) for r in records))
+
+    decoded = list(BinaryDecoder().decode_stream(stream))
+
+    assert decoded == records
+    assert decoded[0]["license"] is decoded[2]["license"]
+
+
+def test_failed_encode_does_not_affect_later_records() -> None:
+    """
+    If encoding a record fails, any licenses in that record are
+    stored in full the next time they're used, because the decoder
+    never sees the failed record.
+    """
+    license = {
+        "id": "cc-by-2.0",
+        "label": "CC BY 2.0",
+        "url": "https://creativecommons.org/licenses/by/2.0/",
+    }
+
+    encoder = BinaryEncoder()
+
+    with pytest.raises(TypeError):
+        encoder.encode({"id": "1", "license": license, "extra": object()})
+
+    records = [{"id": "2", "license": license}, {"id": "3", "license": license}]
+    stream = io.BytesIO(b"".join(encoder.encode(r) for r in records))
+
+    assert list(BinaryDecoder().decode_stream(stream)) == records
+
+
+@pytest.mark.parametrize(
+    "dt",
+    [
+        datetime(1900, 1, 1, 0, 0, 0),
+        datetime(2001, 2, 3, 4, 5, 6, 789, tzinfo=timezone.utc),
+    ],
+)
+def test_round_trip_datetime(dt: datetime) -> None:
+    """
+    Datetimes are decoded with the same value and timezone.
+    """
+    assert loads(dumps(dt)) == dt
+    assert loads(dumps(dt)).tzinfo == dt.tzinfo
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        pytest.param({1: "a", None: "b", 2.5: "c"}, id="non_str_keys"),
+        pytest.param((1, 2, [3, (4, 5)]), id="tuple"),
+        pytest.param(
+            {
+                ("IFD0", "Make"): {
+                    "tagspace": "IFD0",
+                    "tagspaceid": "0",
+                    "tag": "Make",
+                    "label": "Make",
+                    "raw_value": "Canon",
+                }
+            },
+            id="exif_tags",
+        ),
+        pytest.param(
+            {(datetime(2001, 2, 3, tzinfo=timezone.utc), "a"): 1}, id="tuple_key"
+        ),
+    ],
+)
+def test_round_trip_keys_and_tuples(value: typing.Any) -> None:
+    """
+    Tuples and dicts with non-string keys decode to an equal value,
+    rather than turning tuples into lists.
+    """
+    decoded = loads(dumps(value))
+
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_round_trip_tuple_keys_in_a_stream() -> None:
+    """
+    Tuple keys survive decoding a stream of records, e.g. the EXIF tags
+    for several photos.
+    """
+    records = [{("IFD0", "Make"): "Canon"}, {("IFD0", "Make"): "Nikon"}]
+
+    encoder = BinaryEncoder()
+    stream = io.BytesIO(b"".join(encoder.encode(r) for r in records))
+
+    assert list(BinaryDecoder().decode_stream(stream)) == records
+
+
+def test_non_utc_datetime_is_error() -> None:
+    """
+    You can't encode a datetime with a non-UTC timezone.
+    """
+    dt = datetime(2001, 2, 3, 4, 5, 6, tzinfo=timezone(timedelta(hours=1)))
+
+    with pytest.raises(ValueError, match="non-UTC timezone"):
+        dumps(dt)
+
+
+def test_unrecognised_extension_type_is_error() -> None:
+    """
+    Decoding an unrecognised MessagePack extension type is an error.
+    """
+    with pytest.raises(ValueError, match="Unrecognised MessagePack extension type"):
+        loads(msgpack.packb(msgpack.ExtType(42, b"")))
@@ -0,0 +1,78 @@
+"""
+Tests for ``flickr_api.columnar``.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+from flickr_api import FlickrApi
+from flickr_api.columnar import ParquetPhotoWriter, PhotoColumnBuilder
+
+
+def test_write_photos_to_parquet(flickr_api: FlickrApi, tmp_path: Path) -> None:
+    """
+    Photos written to a Parquet file can be read back as columns,
+    and are written in row groups.
+    """
+    photo_ids = ["32812033543", "2959326615", "52994452213", "25868667441"]
+    photos = [flickr_api.get_single_photo_info(photo_id=pid) for pid in photo_ids]
+
+    path = tmp_path / "photos.parquet"
+
+    with ParquetPhotoWriter(path, row_group_size=3) as writer:
+        for photo in photos:
+            writer.write(photo)
+
+    assert pq.ParquetFile(path).metadata.num_row_groups == 2
+
+    table = pq.read_table(path)
+
+    assert table.column("id").to_pylist() == photo_ids
+    assert table.column("license_id").to_pylist() == [
+        p["license"]["id"] for p in photos
+    ]
+    assert table.column("tags").to_pylist() == [p["tags"] for p in photos]
+
+    row = table.slice(0, 1).to_pylist()[0]
+    assert row["owner_id"] == "30884892@N08"
+    assert row["date_posted"] == datetime(2017, 3, 24, 17, 27, 52, tzinfo=timezone.utc)
+    assert row["date_taken"] == datetime(2017, 2, 17, 0, 0, 0)
+    assert row["date_taken_granularity"] == "second"
+
+    # The third photo has a location; the fourth has an unknown date taken.
+    assert table.column("latitude").to_pylist()[2] is not None
+    assert table.column("latitude").to_pylist()[3] is None
+    assert table.column("date_taken").to_pylist()[3] is None
+
+
+def test_write_no_photos_to_parquet(tmp_path: Path) -> None:
+    """
+    If you don't write any photos, you get an empty Parquet file.
+    """
+    path = tmp_path / "photos.parquet"
+
+    with ParquetPhotoWriter(path):
+        pass
+
+    assert pq.read_table(path).num_rows == 0
+
+
+def test_empty_builder_is_empty_table() -> None:
+    """
+    If you haven't added any photos, you get an empty table.
+    """
+    builder = PhotoColumnBuilder()
+
+    assert len(builder) == 0
+    assert builder.to_table().num_rows == 0
+
+
+def test_row_group_size_must_be_positive(tmp_path: Path) -> None:
+    """
+    You can't create a writer with an empty row group.
+    """
+    with pytest.raises(ValueError, match="row_group_size must be positive"):
+        ParquetPhotoWriter(tmp_path / "photos.parquet", row_group_size=0)
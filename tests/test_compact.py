@@ -0,0 +1,172 @@
+"""
+Tests for ``flickr_api.compact``.
+"""
+
+import dataclasses
+import typing
+
+import pytest
+
+from flickr_api import FlickrApi
+from flickr_api.compact import (
+    Comment,
+    ExifTag,
+    Person,
+    SinglePhoto,
+    SinglePhotoInfo,
+    User,
+)
+
+
+def assert_same_fields(compact: typing.Any, original: typing.Any) -> None:
+    """
+    Check that a compact model has the same values as the original
+    TypedDict it was created from.
+    """
+    if dataclasses.is_dataclass(compact):
+        assert isinstance(original, dict)
+        assert set(original) <= {f.name for f in dataclasses.fields(compact)}
+
+        for f in dataclasses.fields(compact):
+            if f.name in original:
+                assert_same_fields(getattr(compact, f.name), original[f.name])
+            else:
+                assert getattr(compact, f.name) == f.default
+    elif isinstance(compact, tuple) and isinstance(original, dict):
+        # e.g. machine tags, which are stored as (key, values) pairs
+        assert len(compact) == len(original)
+
+        for key, values in compact:
+            assert_same_fields(values, original[key])
+    elif isinstance(compact, tuple):
+        assert isinstance(original, list)
+        assert len(compact) == len(original)
+
+        for c, o in zip(compact, original):
+            assert_same_fields(c, o)
+    else:
+        assert compact == original
+
+
+class TestCompactModels:
+    """
+    Tests for converting API results into compact models.
+    """
+
+    @pytest.mark.parametrize(
+        "photo_id",
+        [
+            pytest.param("32812033543"),
+            # This photo has notes
+            pytest.param("2959326615"),
+            # This photo has a location
+            pytest.param("52994452213"),
+        ],
+    )
+    def test_single_photo(self, flickr_api: FlickrApi, photo_id: str) -> None:
+        """
+        A compact ``SinglePhoto`` has the same values as the original.
+        """
+        photo = flickr_api.get_single_photo(photo_id=photo_id)
+        compact_photo = SinglePhoto.from_dict(photo)
+
+        assert_same_fields(compact_photo, photo)
+
+    def test_single_photo_is_hashable(self, flickr_api: FlickrApi) -> None:
+        """
+        A compact ``SinglePhoto`` can be hashed, including a photo
+        with machine tags.
+        """
+        photo = flickr_api.get_single_photo(photo_id="2959326615")
+        assert photo["machine_tags"] != {}
+
+        compact_photo = SinglePhoto.from_dict(photo)
+
+        assert hash(compact_photo) == hash(SinglePhoto.from_dict(photo))
+
+    def test_machine_tags_are_independent_of_the_original(
+        self, flickr_api: FlickrApi
+    ) -> None:
+        """
+        Modifying the machine tags on the original photo doesn't change
+        the compact photo.
+        """
+        photo = flickr_api.get_single_photo(photo_id="2959326615")
+        compact_photo = SinglePhoto.from_dict(photo)
+        machine_tags = compact_photo.machine_tags
+
+        for values in photo["machine_tags"].values():
+            values.append("example")
+        photo["machine_tags"]["example:tag"] = ["example"]
+
+        assert compact_photo.machine_tags == machine_tags
+        assert "example:tag" not in dict(compact_photo.machine_tags)
+
+    def test_single_photo_info(self, flickr_api: FlickrApi) -> None:
+        """
+        A compact ``SinglePhotoInfo`` has the same values as the original.
+        """
+        photo = flickr_api.get_single_photo_info(photo_id="32812033543")
+        compact_photo = SinglePhotoInfo.from_dict(photo)
+
+        assert_same_fields(compact_photo, photo)
+
+    def test_people(self, flickr_api: FlickrApi) -> None:
+        """
+        A compact ``Person`` has the same values as the original.
+        """
+        people = flickr_api.list_people_in_photo(
+            photo_id="2973028271"
+        ) + flickr_api.list_people_in_photo(photo_id="13914947499")
+
+        assert any(p["bounding_box"] is None for p in people)
+        assert any(p["bounding_box"] is not None for p in people)
+
+        for p in people:
+            assert_same_fields(Person.from_dict(p), p)
+
+    def test_comments(self, flickr_api: FlickrApi) -> None:
+        """
+        A compact ``Comment`` has the same values as the original, and
+        comments by the same author share a single ``User``.
+        """
+        comments = flickr_api.list_all_comments(photo_id="40373414385")
+        compact_comments = [Comment.from_dict(c) for c in comments]
+
+        for compact_c, c in zip(compact_comments, comments):
+            assert_same_fields(compact_c, c)
+
+        authors = {id(c.author) for c in compact_comments}
+        author_ids = {c.author.id for c in compact_comments}
+        assert len(authors) == len(author_ids)
+
+    def test_exif_tags(self, flickr_api: FlickrApi) -> None:
+        """
+        A compact ``ExifTag`` has the same values as the original.
+        """
+        exif_tags = flickr_api.get_exif_tags_for_photo(photo_id="54159643533")
+
+        assert any("clean_value" in t for t in exif_tags)
+        assert any("clean_value" not in t for t in exif_tags)
+
+        for t in exif_tags:
+            assert_same_fields(ExifTag.from_dict(t), t)
+
+
+def test_compact_models_are_frozen() -> None:
+    """
+    You can't modify a compact model, because it may be shared.
+    """
+    user = User.from_dict(
+        {
+            "id": "197130754@N07",
+            "username": "Flickr Foundation",
+            "realname": None,
+            "path_alias": "flickrfoundation",
+            "photos_url": "https://www.flickr.com/photos/flickrfoundation/",
+            "profile_url": "https://www.flickr.com/people/flickrfoundation/",
+        }
+    )
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        user.realname = "Flickr Foundation"  # type: ignore[misc]
@@ -0,0 +1,125 @@
+"""
+Tests for ``flickr_api.concurrency``.
+"""
+
+from collections.abc import Iterator
+import threading
+
+import pytest
+
+from flickr_api.concurrency import map_concurrently
+
+
+def test_calls_function_on_every_item() -> None:
+    """
+    Every item is passed to the function, and the results are
+    paired with the item they came from.
+    """
+    results = dict(
+        map_concurrently(lambda x: x * 2, range(100), max_workers=4, catch=ValueError)
+    )
+
+    assert results == {x: x * 2 for x in range(100)}
+
+
+def test_returns_caught_exceptions() -> None:
+    """
+    If the function throws an exception of the ``catch`` type, it's
+    returned as the result for that item, and the other items still run.
+    """
+
+    def check_even(x: int) -> int:
+        """
+        Return even numbers; throw ``ValueError`` for odd numbers.
+        """
+        if x % 2 == 1:
+            raise ValueError(f"odd: {x}")
+        return x
+
+    results = dict(
+        map_concurrently(check_even, range(6), max_workers=2, catch=ValueError)
+    )
+
+    assert [results[x] for x in (0, 2, 4)] == [0, 2, 4]
+    assert all(isinstance(results[x], ValueError) for x in (1, 3, 5))
+
+
+def test_catches_a_tuple_of_exception_types() -> None:
+    """
+    If ``catch`` is a tuple, exceptions of any of those types are
+    returned as the result for that item.
+    """
+
+    def check(x: int) -> int:
+        """
+        Throw ``ValueError`` for 1 and ``KeyError`` for 2.
+        """
+        if x == 1:
+            raise ValueError(x)
+        if x == 2:
+            raise KeyError(x)
+        return x
+
+    results = dict(
+        map_concurrently(check, range(3), max_workers=2, catch=(ValueError, KeyError))
+    )
+
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], KeyError)
+
+
+def test_raises_other_exceptions() -> None:
+    """
+    If the function throws an exception which isn't the ``catch`` type,
+    it's raised to the caller.
+    """
+
+    def fail(x: int) -> int:
+        """
+        Always throw a ``KeyError``.
+        """
+        raise KeyError(x)
+
+    with pytest.raises(KeyError):
+        list(map_concurrently(fail, range(6), max_workers=2, catch=ValueError))
+
+
+def test_only_reads_items_as_needed() -> None:
+    """
+    Items are read from the input lazily, so we don't hold a large
+    number of pending calls in memory.
+    """
+    items_read = 0
+    lock = threading.Lock()
+
+    def generate_items() -> Iterator[int]:
+        """
+        Generate an infinite sequence of items, counting how many are read.
+        """
+        nonlocal items_read
+        while True:
+            with lock:
+                items_read += 1
+            yield items_read
+
+    results = map_concurrently(
+        lambda x: x, generate_items(), max_workers=4, catch=ValueError
+    )
+    next(results)
+    results.close()
+
+    assert items_read <= 4 * 2 + 1
+
+
+@pytest.mark.parametrize("max_workers", [0, -1])
+def test_max_workers_must_be_positive(max_workers: int) -> None:
+    """
+    You can't run calls with fewer than one worker.
+    """
+    with pytest.raises(ValueError, match="max_workers must be positive"):
+        list(
+            map_concurrently(
+                lambda x: x, range(10), max_workers=max_workers, catch=ValueError
+            )
+        )
@@ -2,14 +2,21 @@
 Tests for ``flickr_api.downloader``.
 """
 
+from collections.abc import Iterator
 import hashlib
+import json
 from pathlib import Path
+import threading
 import time
+import typing
 
 import httpx
 import pytest
+import tenacity
 
-from flickr_api import download_file
+from flickr_api import download_file, download_files
+from flickr_api.downloader import DownloadJob, DownloadThrottle, DownloadedFile
+from utils import FakeClock
 
 
 def test_download_photo(vcr_cassette: str, tmp_path: Path) -> None:
@@ -25,6 +32,7 @@ def test_download_photo(vcr_cassette: str, tmp_path: Path) -> None:
     assert result == {
         "path": tmp_path / "53574198477.jpg",
         "content_type": "image/jpeg",
+        "checksum": "sha256:f1fad17327730d4d6cd1a2f2da5ee916e0ed83112f1cc8930d60e8a782420247",
     }
 
     assert result["path"].exists()
@@ -45,7 +53,11 @@ def test_download_video(vcr_cassette: str, tmp_path: Path) -> None:
         base_name="51572201979",
     )
 
-    assert result == {"path": tmp_path / "51572201979.mp4", "content_type": "video/mp4"}
+    assert result == {
+        "path": tmp_path / "51572201979.mp4",
+        "content_type": "video/mp4",
+        "checksum": "sha256:63dc430200501b6338d0cae04909dde8f19147408c7fbf1d3f1d7f9a571c311a",
+    }
 
 
 def test_not_found_is_error(vcr_cassette: str, tmp_path: Path) -> None:
@@ -83,4 +95,1125 @@ def test_an_unrecognised_content_type_is_downloaded_sans_extension(
     assert result == {
         "path": tmp_path / "homepage",
         "content_type": "text/html",
+        "checksum": "sha256:3751d386f78d596d4f88df4720aeef814a7a5258bbd00de57cb49890acc4b82d",
+    }
+
+
+def test_download_files(vcr_cassette: str, tmp_path: Path) -> None:
+    """
+    Download multiple files at once, and get a result for each of them,
+    including the ones that failed.
+    """
+    photo_job: DownloadJob = {
+        "url": "https://live.staticflickr.com/65535/53574198477_fba34d20ca_c_d.jpg",
+        "download_dir": tmp_path / "photos",
+        "base_name": "53574198477",
+    }
+    video_job: DownloadJob = {
+        "url": "https://www.flickr.com/photos/straytoaster/51572201979/play/360p/6737dcd2a7/",
+        "download_dir": tmp_path / "videos/2021",
+        "base_name": "51572201979",
+    }
+    missing_job: DownloadJob = {
+        "url": "https://live.staticflickr.com/65535/doesnotexist.jpg",
+        "download_dir": tmp_path / "photos",
+        "base_name": "doesnotexist",
     }
+
+    results = list(download_files([photo_job, video_job, missing_job], max_workers=2))
+
+    assert len(results) == 3
+    by_name = {job["base_name"]: result for job, result in results}
+
+    assert by_name["53574198477"] == {
+        "path": tmp_path / "photos/53574198477.jpg",
+        "content_type": "image/jpeg",
+        "checksum": "sha256:f1fad17327730d4d6cd1a2f2da5ee916e0ed83112f1cc8930d60e8a782420247",
+    }
+    assert by_name["51572201979"] == {
+        "path": tmp_path / "videos/2021/51572201979.mp4",
+        "content_type": "video/mp4",
+        "checksum": "sha256:63dc430200501b6338d0cae04909dde8f19147408c7fbf1d3f1d7f9a571c311a",
+    }
+    assert isinstance(by_name["doesnotexist"], httpx.HTTPStatusError)
+
+    assert (tmp_path / "photos/53574198477.jpg").stat().st_size == 126058
+    assert not (tmp_path / "photos/doesnotexist").exists()
+
+
+def test_download_files_with_own_client(vcr_cassette: str, tmp_path: Path) -> None:
+    """
+    You can pass your own ``httpx.Client`` to ``download_files()``.
+    """
+    with httpx.Client(headers={"User-Agent": "my-archiver"}) as client:
+        results = list(
+            download_files(
+                [
+                    {
+                        "url": "https://flickr.com",
+                        "download_dir": tmp_path,
+                        "base_name": "homepage",
+                    }
+                ],
+                client=client,
+            )
+        )
+
+    assert results == [
+        (
+            {
+                "url": "https://flickr.com",
+                "download_dir": tmp_path,
+                "base_name": "homepage",
+            },
+            {
+                "path": tmp_path / "homepage",
+                "content_type": "text/html",
+                "checksum": "sha256:3751d386f78d596d4f88df4720aeef814a7a5258bbd00de57cb49890acc4b82d",
+            },
+        )
+    ]
+
+
+# A fake file which we serve from a mock HTTP transport, for testing
+# what happens when downloads are interrupted.
+DATA = bytes(range(256)) * 40
+DATA_SHA256 = "sha256:e96760a87768717bcebcfd25ddc7d46b4dbc95a4b0014def080c08539f7d90d0"
+
+
+class BrokenStream(httpx.SyncByteStream):
+    """
+    A response body which sends some bytes, then drops the connection.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Yield the bytes, then throw a (retryable) read error.
+        """
+        yield self.data
+        raise httpx.ReadError("Connection reset by peer")
+
+
+def interrupted_response(data: bytes) -> httpx.Response:
+    """
+    Create a 200 OK response which is interrupted after ``data``.
+    """
+    return httpx.Response(
+        200, headers={"content-type": "image/jpeg"}, stream=BrokenStream(data)
+    )
+
+
+def mock_client(*responses: httpx.Response) -> tuple[httpx.Client, list[httpx.Request]]:
+    """
+    Create an HTTP client which returns these responses in order,
+    and a list which records the requests it receives.
+    """
+    requests: list[httpx.Request] = []
+    remaining = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """
+        Record the request, and return the next response.
+        """
+        requests.append(request)
+        return remaining.pop(0)
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.fixture
+def no_retry_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Don't wait between retries, so the tests run quickly.
+    """
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+
+
+def download_fake_file(client: httpx.Client, tmp_path: Path) -> Path:
+    """
+    Download the fake file with this client, and check it was
+    downloaded correctly.
+    """
+    result = download_file(
+        client,
+        url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+        download_dir=tmp_path,
+        base_name="12345",
+    )
+
+    assert result == {
+        "path": tmp_path / "12345.jpg",
+        "content_type": "image/jpeg",
+        "checksum": DATA_SHA256,
+    }
+    assert result["path"].read_bytes() == DATA
+
+    # There shouldn't be any partial files left behind.
+    assert list(tmp_path.iterdir()) == [tmp_path / "12345.jpg"]
+
+    return result["path"]
+
+
+@pytest.mark.usefixtures("no_retry_wait")
+class TestResumableDownloads:
+    """
+    If a download is interrupted, we resume it with a Range request
+    rather than downloading the whole file again.
+    """
+
+    @pytest.mark.parametrize("total", ["10240", "*"])
+    def test_resumes_interrupted_download(self, tmp_path: Path, total: str) -> None:
+        """
+        If the connection drops partway through a download, the retry
+        only asks for the bytes we don't have yet.
+        """
+        client, requests = mock_client(
+            interrupted_response(DATA[:4000]),
+            httpx.Response(
+                206,
+                headers={
+                    "content-type": "image/jpeg",
+                    "content-range": f"bytes 4000-10239/{total}",
+                },
+                content=DATA[4000:],
+            ),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert "range" not in requests[0].headers
+        assert requests[1].headers["range"] == "bytes=4000-"
+
+    def test_resumes_after_giving_up(self, tmp_path: Path) -> None:
+        """
+        If we give up on a download, the bytes we've already downloaded
+        are kept, and the next call to ``download_file()`` resumes
+        from where the last one stopped.
+        """
+        client, _ = mock_client(
+            interrupted_response(DATA[:1000]),
+            *[
+                httpx.Response(
+                    206,
+                    headers={
+                        "content-type": "image/jpeg",
+                        "content-range": f"bytes {i}000-10239/10240",
+                    },
+                    stream=BrokenStream(DATA[i * 1000 : (i + 1) * 1000]),
+                )
+                for i in range(1, 5)
+            ],
+        )
+
+        with pytest.raises(tenacity.RetryError):
+            download_fake_file(client, tmp_path)
+
+        (partial_path,) = tmp_path.glob("12345.*.partial")
+        assert partial_path.read_bytes() == DATA[:5000]
+
+        client, requests = mock_client(
+            httpx.Response(
+                206,
+                headers={
+                    "content-type": "image/jpeg",
+                    "content-range": "bytes 5000-10239/10240",
+                },
+                content=DATA[5000:],
+            )
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert requests[0].headers["range"] == "bytes=5000-"
+
+    def test_restarts_if_server_ignores_range(self, tmp_path: Path) -> None:
+        """
+        If the server sends the whole file in response to a Range
+        request, we overwrite the partial file rather than appending.
+        """
+        client, requests = mock_client(
+            interrupted_response(DATA[:4000]),
+            httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert requests[1].headers["range"] == "bytes=4000-"
+
+    def test_restarts_if_range_not_satisfiable(self, tmp_path: Path) -> None:
+        """
+        If the partial file is longer than the file on the server,
+        we throw it away and start again.
+        """
+        client, requests = mock_client(
+            interrupted_response(b"x" * 20000),
+            httpx.Response(416, headers={"content-range": "bytes */10240"}),
+            httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert requests[1].headers["range"] == "bytes=20000-"
+        assert "range" not in requests[2].headers
+
+    @pytest.mark.parametrize(
+        "content_range", [None, "bytes 0-10239/10240", "bytes */10240"]
+    )
+    def test_restarts_if_content_range_is_unexpected(
+        self, tmp_path: Path, content_range: str | None
+    ) -> None:
+        """
+        If the server sends a different part of the file to the part
+        we asked for, we throw away the partial file and start again.
+        """
+        headers = {"content-type": "image/jpeg"}
+
+        if content_range is not None:
+            headers["content-range"] = content_range
+
+        client, requests = mock_client(
+            interrupted_response(DATA[:4000]),
+            httpx.Response(206, headers=headers, content=DATA),
+            httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert requests[1].headers["range"] == "bytes=4000-"
+        assert "range" not in requests[2].headers
+
+    def test_resumes_if_body_is_too_short(self, tmp_path: Path) -> None:
+        """
+        If the server sends fewer bytes than it said it would, we
+        resume from the end of what we got.
+        """
+        client, requests = mock_client(
+            httpx.Response(
+                200,
+                headers={"content-type": "image/jpeg", "content-length": "10240"},
+                stream=httpx.ByteStream(DATA[:4000]),
+            ),
+            httpx.Response(
+                206,
+                headers={
+                    "content-type": "image/jpeg",
+                    "content-range": "bytes 4000-10239/10240",
+                },
+                content=DATA[4000:],
+            ),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert requests[1].headers["range"] == "bytes=4000-"
+
+    def test_restarts_if_body_is_too_long(self, tmp_path: Path) -> None:
+        """
+        If the server sends more bytes than it said it would, we throw
+        away the partial file and start again.
+        """
+        client, requests = mock_client(
+            httpx.Response(
+                200,
+                headers={"content-type": "image/jpeg", "content-length": "10240"},
+                stream=httpx.ByteStream(DATA + b"extra"),
+            ),
+            httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA),
+        )
+
+        download_fake_file(client, tmp_path)
+
+        assert "range" not in requests[1].headers
+
+
+class FakeRangeServer:
+    """
+    A fake HTTP server for the fake file, which supports Range requests.
+
+    You can override the response for particular Range headers, to
+    simulate a server which misbehaves.
+    """
+
+    def __init__(self, *, accept_ranges: bool = True) -> None:
+        self.accept_ranges = accept_ranges
+        self.requests: list[httpx.Request] = []
+        self.overrides: dict[str, list[httpx.Response]] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """
+        Return a response for the requested range of the file.
+        """
+        self.requests.append(request)
+
+        range_header = request.headers.get("range")
+
+        if self.overrides.get(range_header):
+            return self.overrides[range_header].pop(0)
+
+        headers = {"content-type": "image/jpeg"}
+
+        if self.accept_ranges:
+            headers["accept-ranges"] = "bytes"
+
+        if range_header is None or not self.accept_ranges:
+            return httpx.Response(200, headers=headers, content=DATA)
+
+        start, end = range_header.removeprefix("bytes=").split("-")
+        start_pos = int(start)
+        end_pos = int(end) if end else len(DATA) - 1
+
+        headers["content-range"] = f"bytes {start_pos}-{end_pos}/{len(DATA)}"
+
+        return httpx.Response(
+            206, headers=headers, content=DATA[start_pos : end_pos + 1]
+        )
+
+    @property
+    def ranges(self) -> set[str | None]:
+        """
+        The Range headers of all the requests we've received.
+        """
+        return {req.headers.get("range") for req in self.requests}
+
+
+class ConnectionCounter:
+    """
+    Count how many connections to a fake server are open at once.
+
+    A connection can wait for a second connection to open before it
+    responds.  If two connections are allowed at once, they're certain
+    to overlap; if not, the first one gives up waiting after a moment.
+    """
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._barrier = threading.Barrier(2)
+
+    def open(self, resp: httpx.Response, *, wait_for_overlap: bool) -> httpx.Response:
+        """
+        Record that a connection has opened, and return a copy of
+        ``resp`` which records when the connection closes.
+        """
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        if wait_for_overlap:
+            try:
+                self._barrier.wait(timeout=0.5)
+            except threading.BrokenBarrierError:
+                pass
+
+        counter = self
+
+        class TrackedStream(httpx.ByteStream):
+            """
+            A response body which records when its connection closes.
+            """
+
+            def close(self) -> None:
+                """
+                Record that this connection has closed.
+                """
+                with counter._lock:
+                    counter.active -= 1
+
+        return httpx.Response(
+            resp.status_code, headers=resp.headers, stream=TrackedStream(resp.read())
+        )
+
+
+@pytest.mark.usefixtures("no_retry_wait")
+class TestSegmentedDownloads:
+    """
+    Large files can be downloaded as multiple byte ranges in parallel.
+    """
+
+    def download(self, server: FakeRangeServer, tmp_path: Path) -> DownloadedFile:
+        """
+        Download the fake file from this server in 4 segments.
+        """
+        client = httpx.Client(transport=httpx.MockTransport(server.handler))
+
+        return download_file(
+            client,
+            url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+            download_dir=tmp_path,
+            base_name="12345",
+            segments=4,
+            segment_threshold=1000,
+        )
+
+    def test_downloads_large_file_in_segments(self, tmp_path: Path) -> None:
+        """
+        A large file is downloaded in segments, and assembled into
+        the complete file.
+        """
+        server = FakeRangeServer()
+        result = self.download(server, tmp_path)
+
+        assert result == {
+            "path": tmp_path / "12345.jpg",
+            "content_type": "image/jpeg",
+            "checksum": DATA_SHA256,
+        }
+        assert result["path"].read_bytes() == DATA
+        assert list(tmp_path.iterdir()) == [tmp_path / "12345.jpg"]
+
+        assert server.ranges == {
+            None,
+            "bytes=0-2559",
+            "bytes=2560-5119",
+            "bytes=5120-7679",
+            "bytes=7680-10239",
+        }
+
+    def test_small_file_is_not_segmented(self, tmp_path: Path) -> None:
+        """
+        A file smaller than the threshold is downloaded in one request.
+        """
+        server = FakeRangeServer()
+        client = httpx.Client(transport=httpx.MockTransport(server.handler))
+
+        download_file(
+            client,
+            url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+            download_dir=tmp_path,
+            base_name="12345",
+            segments=4,
+        )
+
+        assert (tmp_path / "12345.jpg").read_bytes() == DATA
+        assert server.ranges == {None}
+
+    def test_file_is_not_segmented_without_range_support(self, tmp_path: Path) -> None:
+        """
+        If the server doesn't support Range requests, the file is
+        downloaded in one request.
+        """
+        server = FakeRangeServer(accept_ranges=False)
+        self.download(server, tmp_path)
+
+        assert (tmp_path / "12345.jpg").read_bytes() == DATA
+        assert server.ranges == {None}
+
+    def test_retries_interrupted_segment(self, tmp_path: Path) -> None:
+        """
+        If a segment is interrupted, only that segment is retried,
+        starting from the last byte we got.
+        """
+        server = FakeRangeServer()
+        server.overrides["bytes=5120-7679"] = [
+            httpx.Response(
+                206,
+                headers={"content-range": "bytes 5120-7679/10240"},
+                stream=BrokenStream(DATA[5120:6000]),
+            )
+        ]
+
+        result = self.download(server, tmp_path)
+
+        assert result["path"].read_bytes() == DATA
+        assert "bytes=6000-7679" in server.ranges
+        assert len(server.requests) == 6
+
+    @pytest.mark.parametrize(
+        "bad_response",
+        [
+            pytest.param(httpx.Response(200, content=DATA), id="ignores_range"),
+            pytest.param(
+                httpx.Response(
+                    206,
+                    headers={"content-range": "bytes 0-2559/10240"},
+                    content=DATA[:2560],
+                ),
+                id="wrong_range",
+            ),
+            pytest.param(
+                httpx.Response(
+                    206,
+                    headers={"content-range": "bytes 5120-7679/10240"},
+                    content=DATA[5120:],
+                ),
+                id="too_many_bytes",
+            ),
+            pytest.param(
+                httpx.Response(
+                    206,
+                    headers={"content-range": "bytes 5120-7679/10240"},
+                    content=DATA[5120:6000],
+                ),
+                id="too_few_bytes",
+            ),
+        ],
+    )
+    def test_retries_bad_segment(
+        self, tmp_path: Path, bad_response: httpx.Response
+    ) -> None:
+        """
+        If the server sends the wrong bytes for a segment, we retry
+        that segment.
+        """
+        server = FakeRangeServer()
+        server.overrides["bytes=5120-7679"] = [bad_response]
+
+        result = self.download(server, tmp_path)
+
+        assert result["path"].read_bytes() == DATA
+
+    def test_failed_segment_is_error(self, tmp_path: Path) -> None:
+        """
+        If a segment fails with a non-retryable error, the download
+        fails and the partial file is deleted.
+        """
+        server = FakeRangeServer()
+        server.overrides["bytes=5120-7679"] = [httpx.Response(404)]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            self.download(server, tmp_path)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("segments", [0, -1])
+def test_segments_must_be_positive(tmp_path: Path, segments: int) -> None:
+    """
+    You can't download a file in zero or fewer segments.
+    """
+    with pytest.raises(ValueError, match="segments must be positive"):
+        download_file(
+            url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+            download_dir=tmp_path,
+            base_name="12345",
+            segments=segments,
+        )
+
+    with pytest.raises(ValueError, match="segments must be positive"):
+        list(download_files([], segments=segments))
+
+
+class TestSkipIfUnchanged:
+    """
+    If you pass ``skip_if_unchanged=True``, we only download a file
+    again if it's changed on the server.
+    """
+
+    url = "https://live.staticflickr.com/65535/12345_abcdef_o.jpg"
+
+    def ok_response(self, data: bytes = DATA) -> httpx.Response:
+        """
+        Return a response with the fake file, and cache validators.
+        """
+        return httpx.Response(
+            200,
+            headers={
+                "content-type": "image/jpeg",
+                "etag": '"abc123"',
+                "last-modified": "Fri, 08 Mar 2024 15:54:33 GMT",
+            },
+            content=data,
+        )
+
+    def download(
+        self, client: httpx.Client, tmp_path: Path, *, skip_if_unchanged: bool = True
+    ) -> DownloadedFile:
+        """
+        Download the fake file with this client.
+        """
+        return download_file(
+            client,
+            url=self.url,
+            download_dir=tmp_path,
+            base_name="12345",
+            skip_if_unchanged=skip_if_unchanged,
+        )
+
+    def test_records_metadata(self, tmp_path: Path) -> None:
+        """
+        When we download a file, we record its metadata in a sidecar.
+        """
+        client, _ = mock_client(self.ok_response())
+        self.download(client, tmp_path)
+
+        metadata = json.loads((tmp_path / "12345.download.json").read_text())
+
+        assert metadata == {
+            "url": self.url,
+            "file_name": "12345.jpg",
+            "content_type": "image/jpeg",
+            "checksum": DATA_SHA256,
+            "content_length": 10240,
+            "etag": '"abc123"',
+            "last_modified": "Fri, 08 Mar 2024 15:54:33 GMT",
+        }
+
+    def test_no_metadata_by_default(self, tmp_path: Path) -> None:
+        """
+        If you don't pass ``skip_if_unchanged``, we don't record
+        any metadata or send conditional requests.
+        """
+        client, requests = mock_client(self.ok_response(), self.ok_response())
+        self.download(client, tmp_path, skip_if_unchanged=False)
+        self.download(client, tmp_path, skip_if_unchanged=False)
+
+        assert list(tmp_path.iterdir()) == [tmp_path / "12345.jpg"]
+        assert "if-none-match" not in requests[1].headers
+
+    def test_unchanged_file_is_not_downloaded_again(self, tmp_path: Path) -> None:
+        """
+        If the server says the file hasn't changed, we return the
+        existing file without downloading it again.
+        """
+        client, requests = mock_client(self.ok_response(), httpx.Response(304))
+
+        first = self.download(client, tmp_path)
+        mtime = first["path"].stat().st_mtime_ns
+
+        second = self.download(client, tmp_path)
+
+        assert second == first
+        assert second["path"].read_bytes() == DATA
+        assert second["path"].stat().st_mtime_ns == mtime
+
+        assert requests[1].headers["if-none-match"] == '"abc123"'
+        assert (
+            requests[1].headers["if-modified-since"] == "Fri, 08 Mar 2024 15:54:33 GMT"
+        )
+
+    def test_changed_file_is_downloaded_again(self, tmp_path: Path) -> None:
+        """
+        If the server sends a new version of the file, we replace
+        the existing file and its metadata.
+        """
+        new_data = DATA[::-1]
+
+        client, requests = mock_client(
+            self.ok_response(),
+            httpx.Response(
+                200,
+                headers={"content-type": "image/jpeg", "etag": '"def456"'},
+                content=new_data,
+            ),
+            httpx.Response(304),
+        )
+
+        self.download(client, tmp_path)
+        result = self.download(client, tmp_path)
+
+        assert result["path"].read_bytes() == new_data
+        assert requests[1].headers["if-none-match"] == '"abc123"'
+
+        metadata = json.loads((tmp_path / "12345.download.json").read_text())
+        assert metadata["etag"] == '"def456"'
+        assert metadata["last_modified"] is None
+
+        # The next request uses the new ETag, and there's no
+        # Last-Modified date to send.
+        self.download(client, tmp_path)
+
+        assert requests[2].headers["if-none-match"] == '"def456"'
+        assert "if-modified-since" not in requests[2].headers
+
+    def test_only_sends_validators_we_have(self, tmp_path: Path) -> None:
+        """
+        If the server only sent a Last-Modified header, we only send
+        an If-Modified-Since header.
+        """
+        client, requests = mock_client(
+            httpx.Response(
+                200,
+                headers={
+                    "content-type": "image/jpeg",
+                    "last-modified": "Fri, 08 Mar 2024 15:54:33 GMT",
+                },
+                content=DATA,
+            ),
+            httpx.Response(304),
+        )
+
+        self.download(client, tmp_path)
+        self.download(client, tmp_path)
+
+        assert "if-none-match" not in requests[1].headers
+        assert "if-modified-since" in requests[1].headers
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            pytest.param(
+                lambda tmp_path: (tmp_path / "12345.jpg").unlink(), id="deleted"
+            ),
+            pytest.param(
+                lambda tmp_path: (tmp_path / "12345.jpg").write_bytes(b"truncated"),
+                id="modified",
+            ),
+            pytest.param(
+                lambda tmp_path: (tmp_path / "12345.download.json").write_text("{"),
+                id="corrupt_metadata",
+            ),
+        ],
+    )
+    def test_downloads_again_if_local_file_is_changed(
+        self, tmp_path: Path, change: typing.Callable[[Path], typing.Any]
+    ) -> None:
+        """
+        If the local file or its metadata has been changed since we
+        downloaded it, we download it again unconditionally.
+        """
+        client, requests = mock_client(self.ok_response(), self.ok_response())
+
+        self.download(client, tmp_path)
+        change(tmp_path)
+        result = self.download(client, tmp_path)
+
+        assert result["path"].read_bytes() == DATA
+        assert "if-none-match" not in requests[1].headers
+
+    def test_downloads_again_if_url_is_different(self, tmp_path: Path) -> None:
+        """
+        If we previously downloaded a different URL to the same path,
+        we don't send a conditional request.
+        """
+        client, requests = mock_client(self.ok_response(), self.ok_response())
+
+        download_file(
+            client,
+            url="https://live.staticflickr.com/65535/12345_abcdef_b.jpg",
+            download_dir=tmp_path,
+            base_name="12345",
+            skip_if_unchanged=True,
+        )
+        self.download(client, tmp_path)
+
+        assert "if-none-match" not in requests[1].headers
+
+
+class TestChecksums:
+    """
+    We compute a checksum of each file as we download it.
+    """
+
+    def test_uses_hash_algorithm(self, tmp_path: Path) -> None:
+        """
+        You can choose the hash algorithm used for the checksum.
+        """
+        client, _ = mock_client(
+            httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA)
+        )
+
+        result = download_file(
+            client,
+            url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+            download_dir=tmp_path,
+            base_name="12345",
+            hash_algorithm="md5",
+        )
+
+        assert result["checksum"] == "md5:c3cd26e07e555c0116db237fbc06d99c"
+
+    def test_rehashes_unchanged_file_with_new_algorithm(self, tmp_path: Path) -> None:
+        """
+        If a file hasn't changed, but you ask for a different hash
+        algorithm, we hash the existing file.
+        """
+        client, _ = mock_client(
+            httpx.Response(
+                200,
+                headers={"content-type": "image/jpeg", "etag": '"abc123"'},
+                content=DATA,
+            ),
+            httpx.Response(304),
+        )
+
+        for hash_algorithm in ("sha256", "md5"):
+            result = download_file(
+                client,
+                url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+                download_dir=tmp_path,
+                base_name="12345",
+                skip_if_unchanged=True,
+                hash_algorithm=hash_algorithm,
+            )
+
+        assert result["checksum"] == "md5:c3cd26e07e555c0116db237fbc06d99c"
+
+    @pytest.mark.parametrize("hash_algorithm", ["sha257", "shake_128"])
+    def test_unsupported_hash_algorithm_is_error(
+        self, tmp_path: Path, hash_algorithm: str
+    ) -> None:
+        """
+        If you ask for a hash algorithm we can't use, you get
+        a ``ValueError`` before we download anything.
+        """
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            download_file(
+                url="https://live.staticflickr.com/65535/12345_abcdef_o.jpg",
+                download_dir=tmp_path,
+                base_name="12345",
+                hash_algorithm=hash_algorithm,
+            )
+
+
+class TestContentAddressedStorage:
+    """
+    If you pass ``content_addressed_dir``, files are stored by checksum,
+    and linked to the requested name.
+    """
+
+    def download(
+        self, client: httpx.Client, tmp_path: Path, *, base_name: str
+    ) -> DownloadedFile:
+        """
+        Download the fake file into content-addressed storage.
+        """
+        return download_file(
+            client,
+            url=f"https://live.staticflickr.com/65535/{base_name}_abcdef_o.jpg",
+            download_dir=tmp_path / "photos",
+            base_name=base_name,
+            content_addressed_dir=tmp_path / "store",
+        )
+
+    def ok_response(self) -> httpx.Response:
+        """
+        Return a response with the fake file.
+        """
+        return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=DATA)
+
+    def test_file_is_linked_to_stored_copy(self, tmp_path: Path) -> None:
+        """
+        The file is stored under its checksum, and the requested path
+        is a link to the stored file.
+        """
+        client, _ = mock_client(self.ok_response())
+
+        result = self.download(client, tmp_path, base_name="12345")
+
+        stored_path = (
+            tmp_path
+            / "store/sha256/e9/e96760a87768717bcebcfd25ddc7d46b4dbc95a4b0014def080c08539f7d90d0.jpg"
+        )
+
+        assert result == {
+            "path": tmp_path / "photos/12345.jpg",
+            "content_type": "image/jpeg",
+            "checksum": DATA_SHA256,
+        }
+        assert result["path"].read_bytes() == DATA
+        assert result["path"].samefile(stored_path)
+        assert list((tmp_path / "photos").iterdir()) == [result["path"]]
+
+    def test_duplicate_files_are_stored_once(self, tmp_path: Path) -> None:
+        """
+        If two files have the same contents, we only store one copy.
+        """
+        client, _ = mock_client(self.ok_response(), self.ok_response())
+
+        result1 = self.download(client, tmp_path, base_name="12345")
+        result2 = self.download(client, tmp_path, base_name="67890")
+
+        assert result1["path"].samefile(result2["path"])
+        assert len(list((tmp_path / "store").glob("**/*.jpg"))) == 1
+        assert sorted((tmp_path / "photos").iterdir()) == [
+            tmp_path / "photos/12345.jpg",
+            tmp_path / "photos/67890.jpg",
+        ]
+
+    def test_downloading_again_keeps_link(self, tmp_path: Path) -> None:
+        """
+        If you download the same file to the same path twice, you
+        still get a link to the stored copy, and no leftover files.
+        """
+        client, _ = mock_client(self.ok_response(), self.ok_response())
+
+        self.download(client, tmp_path, base_name="12345")
+        result = self.download(client, tmp_path, base_name="12345")
+
+        assert result["path"].read_bytes() == DATA
+        assert result["path"].stat().st_nlink == 2
+        assert list((tmp_path / "photos").iterdir()) == [result["path"]]
+
+    def test_changed_file_is_relinked(self, tmp_path: Path) -> None:
+        """
+        If a file changes, the requested path is linked to the new
+        stored copy, and the old stored copy is kept.
+        """
+        client, _ = mock_client(
+            self.ok_response(),
+            httpx.Response(
+                200, headers={"content-type": "image/jpeg"}, content=DATA[::-1]
+            ),
+        )
+
+        self.download(client, tmp_path, base_name="12345")
+        result = self.download(client, tmp_path, base_name="12345")
+
+        assert result["path"].read_bytes() == DATA[::-1]
+        assert len(list((tmp_path / "store").glob("**/*.jpg"))) == 2
+        assert list((tmp_path / "photos").iterdir()) == [result["path"]]
+
+
+class TestDownloadThrottle:
+    """
+    You can limit the bandwidth and connections used by downloads.
+    """
+
+    url = "https://live.staticflickr.com/65535/12345_abcdef_o.jpg"
+
+    def chunked_response(self) -> httpx.Response:
+        """
+        Return a response which sends the fake file in 1KB chunks.
+        """
+        return httpx.Response(
+            200,
+            headers={"content-type": "image/jpeg"},
+            content=iter([DATA[i : i + 1024] for i in range(0, len(DATA), 1024)]),
+        )
+
+    def test_limits_bandwidth(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Downloads are slowed down to stay under the bandwidth limit,
+        and the limit is shared by every download using the throttle.
+        """
+        clock = FakeClock()
+        monkeypatch.setattr("time.monotonic", clock.monotonic)
+        monkeypatch.setattr("time.sleep", clock.sleep)
+
+        throttle = DownloadThrottle(max_bytes_per_second=2048)
+        client, _ = mock_client(self.chunked_response(), self.chunked_response())
+
+        for base_name in ("12345", "67890"):
+            result = download_file(
+                client,
+                url=self.url,
+                download_dir=tmp_path,
+                base_name=base_name,
+                throttle=throttle,
+            )
+            assert result["path"].read_bytes() == DATA
+
+        # We downloaded 20KB at 2KB/s, which is 10 seconds, but the
+        # first second was allowed as a burst.
+        assert sum(clock.sleeps) == pytest.approx(9.0)
+
+    def test_limits_connections_per_host(self, tmp_path: Path) -> None:
+        """
+        We don't open more connections to a host than its limit,
+        even when downloading in segments.
+        """
+        server = FakeRangeServer()
+        connections = ConnectionCounter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """
+            Return the requested part of the file, counting how many
+            connections are open.  The segments wait for each other,
+            so they overlap if they're allowed to.
+            """
+            return connections.open(
+                server.handler(request),
+                wait_for_overlap="range" in request.headers,
+            )
+
+        result = download_file(
+            httpx.Client(transport=httpx.MockTransport(handler)),
+            url=self.url,
+            download_dir=tmp_path,
+            base_name="12345",
+            segments=4,
+            segment_threshold=1000,
+            throttle=DownloadThrottle(
+                max_connections_per_host={"live.staticflickr.com": 1}
+            ),
+        )
+
+        assert result["path"].read_bytes() == DATA
+        assert len(server.requests) == 5
+        assert connections.max_active == 1
+        assert connections.active == 0
+
+    def test_limits_connections_to_host_after_redirects(self, tmp_path: Path) -> None:
+        """
+        If a URL redirects to another host, the connection limit is for
+        the host we download the bytes from.
+        """
+        connections = ConnectionCounter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """
+            Redirect photo pages to the static file server, which counts
+            how many connections are open.  The downloads wait for each
+            other, so they overlap if they're allowed to.
+            """
+            if request.url.host == "www.flickr.com":
+                return httpx.Response(302, headers={"location": self.url})
+
+            return connections.open(
+                httpx.Response(
+                    200, headers={"content-type": "image/jpeg"}, content=DATA
+                ),
+                wait_for_overlap=True,
+            )
+
+        jobs: list[DownloadJob] = [
+            {
+                "url": f"https://www.flickr.com/photos/example/{i}/play/orig/",
+                "download_dir": tmp_path,
+                "base_name": str(i),
+            }
+            for i in range(4)
+        ]
+
+        results = list(
+            download_files(
+                jobs,
+                client=httpx.Client(transport=httpx.MockTransport(handler)),
+                max_workers=4,
+                throttle=DownloadThrottle(
+                    max_connections_per_host={"live.staticflickr.com": 1}
+                ),
+            )
+        )
+
+        assert all(isinstance(result, dict) for _, result in results)
+        assert connections.max_active == 1
+        assert connections.active == 0
+
+    def test_too_many_redirects_is_error(self, tmp_path: Path) -> None:
+        """
+        If a URL keeps redirecting, we give up.
+        """
+        client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(302, headers={"location": self.url})
+            ),
+            max_redirects=3,
+        )
+
+        with pytest.raises(httpx.TooManyRedirects):
+            download_file(
+                client,
+                url=self.url,
+                download_dir=tmp_path,
+                base_name="12345",
+                throttle=DownloadThrottle(
+                    max_connections_per_host={"live.staticflickr.com": 1}
+                ),
+            )
+
+    @pytest.mark.parametrize("max_connections", [0, -1])
+    def test_max_connections_must_be_positive(self, max_connections: int) -> None:
+        """
+        You can't limit a host to zero or fewer connections.
+        """
+        with pytest.raises(ValueError, match="must be positive"):
+            DownloadThrottle(
+                max_connections_per_host={"live.staticflickr.com": max_connections}
+            )
@@ -0,0 +1,76 @@
+"""
+Tests for ``flickr_api.ndjson``.
+"""
+
+from pathlib import Path
+
+from flickr_api import FlickrApi
+from flickr_api.models import Comment, PhotoContext, SinglePhoto
+from flickr_api.models.licenses import LicenseChangeEntry
+from flickr_api.ndjson import NdjsonWriter, read_ndjson
+
+
+def test_round_trip_single_photo(flickr_api: FlickrApi, tmp_path: Path) -> None:
+    """
+    A photo written as NDJSON can be read back, including datetimes.
+    """
+    photo = flickr_api.get_single_photo(photo_id="32812033543")
+
+    with NdjsonWriter(tmp_path / "photos.ndjson") as writer:
+        writer.write(photo)
+
+    assert list(read_ndjson(tmp_path / "photos.ndjson", model=SinglePhoto)) == [photo]
+
+
+def test_round_trip_comments(flickr_api: FlickrApi, tmp_path: Path) -> None:
+    """
+    Comments written as NDJSON can be read back, one per line.
+    """
+    comments = flickr_api.list_all_comments(photo_id="40373414385")
+
+    with NdjsonWriter(tmp_path / "comments.ndjson", buffer_size=256) as writer:
+        writer.write_all(comments)
+
+    assert len((tmp_path / "comments.ndjson").read_text().splitlines()) == len(comments)
+    assert list(read_ndjson(tmp_path / "comments.ndjson", model=Comment)) == comments
+
+
+def test_round_trip_license_history(flickr_api: FlickrApi, tmp_path: Path) -> None:
+    """
+    License changes written as NDJSON can be read back.
+    """
+    history = flickr_api.get_license_history(photo_id="54450311696")
+
+    with NdjsonWriter(tmp_path / "history.ndjson") as writer:
+        writer.write_all(history)
+
+    # All the entries in this photo's history are license changes.
+    model = LicenseChangeEntry.ChangedLicense
+
+    assert list(read_ndjson(tmp_path / "history.ndjson", model=model)) == history
+
+
+def test_round_trip_photo_contexts(flickr_api: FlickrApi, tmp_path: Path) -> None:
+    """
+    Photo contexts written as NDJSON can be read back.
+    """
+    contexts = flickr_api.get_photo_contexts(photo_id="53563844904")
+
+    with NdjsonWriter(tmp_path / "contexts.ndjson") as writer:
+        writer.write(contexts)
+
+    assert list(read_ndjson(tmp_path / "contexts.ndjson", model=PhotoContext)) == [
+        contexts
+    ]
+
+
+def test_blank_lines_are_skipped(tmp_path: Path) -> None:
+    """
+    Blank lines in an NDJSON file are ignored.
+    """
+    (tmp_path / "records.ndjson").write_text('{"id": "1"}\n\n{"id": "2"}\n')
+
+    assert list(read_ndjson(tmp_path / "records.ndjson", model=dict)) == [
+        {"id": "1"},
+        {"id": "2"},
+    ]
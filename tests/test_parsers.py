@@ -4,7 +4,15 @@ Tests for `flickr_api.parsers`.
 
 import pytest
 
-from flickr_api.parsers import parse_date_taken, parse_machine_tags, parse_safety_level
+from flickr_api import FlickrApi
+from flickr_api.parsers import (
+    create_user,
+    parse_date_taken,
+    parse_machine_tags,
+    parse_machine_tags_in_bulk,
+    parse_safety_level,
+    UserCache,
+)
 
 
 def test_unrecognised_date_granularity_is_error() -> None:
@@ -55,3 +63,115 @@ class TestParseMachine_Tags:
             "bhl:page=33665645",
         ]
         assert parse_machine_tags(tags) == {"bhl:page": ["33665645"]}
+
+    def test_colon_tags_which_arent_machine_tags_are_skipped(self) -> None:
+        """
+        Tags which contain the machine tag separators but don't match
+        the machine tag syntax aren't machine tags.
+        """
+        tags = ["time: 12:30", "a=b", "shape:=4", "geo:lat="]
+        assert parse_machine_tags(tags) == {}
+
+    def test_repeated_predicates_are_grouped(self) -> None:
+        """
+        If a namespace/predicate appears multiple times, all the values
+        are returned in order.
+        """
+        tags = ["square", "shape:sides=4", "shape:color=red", "shape:color=blue"]
+        assert parse_machine_tags(tags) == {
+            "shape:sides": ["4"],
+            "shape:color": ["red", "blue"],
+        }
+
+
+def test_parse_machine_tags_in_bulk() -> None:
+    """
+    Parsing machine tags in bulk gets the same result as parsing
+    each list of tags individually.
+    """
+    tag_lists = [
+        [],
+        ["square", "shape:sides=4", "shape:color=red", "shape:color=blue"],
+        ["square", "bhl:page=33665645", "time: 12:30"],
+        ["shape:color=red", "shape:color=red"],
+    ]
+
+    result = parse_machine_tags_in_bulk(tag_lists)
+
+    assert result == [parse_machine_tags(tags) for tags in tag_lists]
+    assert result == [
+        {},
+        {"shape:sides": ["4"], "shape:color": ["red", "blue"]},
+        {"bhl:page": ["33665645"]},
+        {"shape:color": ["red", "red"]},
+    ]
+
+
+def test_parse_machine_tags_in_bulk_shares_keys() -> None:
+    """
+    When parsing machine tags in bulk, photos with the same
+    ``namespace:predicate`` share a single copy of the key.
+    """
+    result = parse_machine_tags_in_bulk([["bhl:page=33665645"], ["bhl:page=33665646"]])
+
+    key1, key2 = (next(iter(machine_tags)) for machine_tags in result)
+
+    assert key1 == key2 == "bhl:page"
+    assert key1 is key2
+
+
+class TestUserCache:
+    """
+    Tests for ``UserCache``.
+    """
+
+    def test_same_user_is_shared(self) -> None:
+        """
+        Creating the same user twice with a cache returns the same object,
+        which is the same as creating the user without a cache.
+        """
+        cache = UserCache()
+
+        user1 = create_user("1234@N01", "alex", "Alex", "alexwlchan", cache=cache)
+        user2 = create_user("1234@N01", "alex", "Alex", "alexwlchan", cache=cache)
+
+        assert user1 is user2
+        assert user1 == create_user("1234@N01", "alex", "Alex", "alexwlchan")
+
+    def test_different_users_are_different(self) -> None:
+        """
+        Users with different attributes get different objects.
+        """
+        cache = UserCache()
+
+        user1 = create_user("1234@N01", "alex", "Alex", None, cache=cache)
+        user2 = create_user("1234@N01", "alex", "Alex", None, True, cache=cache)
+
+        assert user1 is not user2
+        assert "is_deleted" not in user1
+        assert user2["is_deleted"]
+
+    def test_cache_is_bounded(self) -> None:
+        """
+        When the cache is full, old users are discarded.
+        """
+        cache = UserCache(maxsize=1)
+
+        user1 = create_user("1234@N01", "alex", "Alex", None, cache=cache)
+        create_user("5678@N01", "chan", None, None, cache=cache)
+        user3 = create_user("1234@N01", "alex", "Alex", None, cache=cache)
+
+        assert user1 is not user3
+        assert user1 == user3
+
+    def test_pass_cache_to_client_with_api_key(self) -> None:
+        """
+        You can pass a cache when you create a client from an API key.
+        """
+        cache = UserCache()
+
+        api = FlickrApi.with_api_key(
+            api_key="<KEY>", user_agent="<USER_AGENT>", user_cache=cache
+        )
+
+        assert api.user_cache is cache
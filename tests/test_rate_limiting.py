@@ -0,0 +1,76 @@
+"""
+Tests for ``flickr_api.rate_limiting``.
+"""
+
+import pytest
+
+from flickr_api.rate_limiting import RateLimiter
+from utils import FakeClock
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """
+    Replace the clock used by the rate limiter with a fake clock.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr("time.monotonic", clock.monotonic)
+    monkeypatch.setattr("time.sleep", clock.sleep)
+    return clock
+
+
+def test_spaces_out_calls(clock: FakeClock) -> None:
+    """
+    After the first call, each call waits until the rate allows it.
+    """
+    limiter = RateLimiter(rate=2)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_allows_bursts(clock: FakeClock) -> None:
+    """
+    Up to ``burst`` calls can go ahead immediately.
+    """
+    limiter = RateLimiter(rate=1, burst=3)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [1.0]
+
+
+def test_refills_over_time(clock: FakeClock) -> None:
+    """
+    If there's a gap between calls, the next call doesn't wait.
+    """
+    limiter = RateLimiter(rate=1)
+    limiter.acquire()
+    clock.now += 5
+    limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_large_amounts_wait_longer(clock: FakeClock) -> None:
+    """
+    Acquiring multiple units waits for all of them, e.g. when limiting
+    the number of bytes per second.
+    """
+    limiter = RateLimiter(rate=1000, burst=1000)
+    limiter.acquire(1000)
+    limiter.acquire(500)
+
+    assert clock.sleeps == [0.5]
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": -1}, {"rate": 1, "burst": 0}])
+def test_rate_and_burst_must_be_positive(kwargs: dict[str, float]) -> None:
+    """
+    You can't create a rate limiter with a non-positive rate or burst.
+    """
+    with pytest.raises(ValueError, match="must be positive"):
+        RateLimiter(**kwargs)
@@ -0,0 +1,76 @@
+"""
+Tests for ``flickr_api.user_id_cache``.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+from flickr_api import FlickrApi
+from flickr_api.user_id_cache import UserIdCache
+
+
+def test_get_missing_path_alias_is_none(tmp_path: Path) -> None:
+    """
+    Looking up a path alias which isn't in the cache returns ``None``.
+    """
+    cache = UserIdCache(tmp_path / "user_ids.db")
+
+    assert cache.get("britishlibrary") is None
+
+
+def test_set_and_get(tmp_path: Path) -> None:
+    """
+    You can store a user ID and get it back, ignoring the case
+    of the path alias.
+    """
+    cache = UserIdCache(tmp_path / "user_ids.db")
+    cache.set("britishlibrary", "12403504@N02")
+
+    assert cache.get("britishlibrary") == "12403504@N02"
+    assert cache.get("BritishLibrary") == "12403504@N02"
+
+
+def test_is_shared_between_instances(tmp_path: Path) -> None:
+    """
+    The cache is saved to disk, so it can be read by another
+    instance (e.g. in a different process).
+    """
+    UserIdCache(tmp_path / "user_ids.db").set("britishlibrary", "12403504@N02")
+
+    assert UserIdCache(tmp_path / "user_ids.db").get("britishlibrary") == (
+        "12403504@N02"
+    )
+
+
+def test_expired_entries_are_ignored(tmp_path: Path) -> None:
+    """
+    Entries older than the TTL aren't returned.
+    """
+    cache = UserIdCache(tmp_path / "user_ids.db", ttl=timedelta(seconds=0))
+    cache.set("britishlibrary", "12403504@N02")
+
+    assert cache.get("britishlibrary") is None
+
+
+def test_delete(tmp_path: Path) -> None:
+    """
+    You can remove an entry from the cache.
+    """
+    cache = UserIdCache(tmp_path / "user_ids.db")
+    cache.set("britishlibrary", "12403504@N02")
+    cache.delete("britishlibrary")
+
+    assert cache.get("britishlibrary") is None
+
+
+def test_pass_cache_to_client_with_api_key(tmp_path: Path) -> None:
+    """
+    You can pass a cache when you create a client from an API key.
+    """
+    cache = UserIdCache(tmp_path / "user_ids.db")
+
+    api = FlickrApi.with_api_key(
+        api_key="<KEY>", user_agent="<USER_AGENT>", user_id_cache=cache
+    )
+
+    assert api.user_id_cache is cache
@@ -25,3 +25,26 @@ def get_fixture(filename: str, *, model: type[T]) -> T:
         model=model,
         cls=NitrateDecoder,
     )
+
+
+class FakeClock:
+    """
+    A clock which only moves forward when somebody sleeps.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        """
+        Return the current time.
+        """
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Record the sleep, and move the clock forward.
+        """
+        self.sleeps.append(seconds)
+        self.now += seconds